@@ -2,6 +2,7 @@
 Django管理后台配置
 """
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
 from .models import Category, Article, ArticleImage, Tag, Comment, Like
 
@@ -21,6 +22,15 @@ class ArticleImageInline(admin.TabularInline):
     fields = ['image', 'caption']
 
 
+class ArticleTagInline(admin.TabularInline):
+    """词条标签内联编辑（自动补全选择标签）"""
+    model = Tag.articles.through
+    extra = 1
+    autocomplete_fields = ['tag']
+    verbose_name = '标签'
+    verbose_name_plural = '标签'
+
+
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
     """词条管理"""
@@ -48,7 +58,7 @@ class ArticleAdmin(admin.ModelAdmin):
         }),
     ]
     
-    inlines = [ArticleImageInline]
+    inlines = [ArticleImageInline, ArticleTagInline]
     
     def save_model(self, request, obj, form, change):
         """保存模型时设置作者"""
@@ -62,12 +72,17 @@ class TagAdmin(admin.ModelAdmin):
     """标签管理"""
     list_display = ['name', 'get_article_count', 'created_at']
     search_fields = ['name']
-    filter_horizontal = ['articles']
+    autocomplete_fields = ['articles']
+    
+    def get_queryset(self, request):
+        """列表页一次查询带出关联词条数量"""
+        return super().get_queryset(request).annotate(article_count=Count('articles'))
     
     def get_article_count(self, obj):
         """获取关联词条数量"""
-        return obj.articles.count()
+        return obj.article_count
     get_article_count.short_description = '关联词条数'
+    get_article_count.admin_order_field = 'article_count'
 
 
 @admin.register(Comment)
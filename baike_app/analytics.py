@@ -0,0 +1,199 @@
+"""
+词条行为统计 - 百度百科风格项目
+
+请求中只把浏览、点赞、评论事件追加到进程内缓冲区，攒够一批或超过刷新间隔后
+一次 bulk_create 写入 ArticleEvent；每个请求结束时也会检查刷新间隔，空闲的
+worker 不会长时间积压事件。compact_analytics 命令定期把原始事件汇总为
+每个词条、每个分类每天一行的统计，并删除已汇总的原始事件，原始表大小保持有界。
+"""
+import atexit
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Article, ArticleDailyStat, ArticleEvent, Category, CategoryDailyStat
+
+EVENT_FIELDS = {
+    'view': 'views',
+    'like': 'likes',
+    'comment': 'comments',
+}
+
+
+class EventBuffer:
+    """进程内事件缓冲区，批量写入数据库"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = []
+        self._last_flush = time.monotonic()
+
+    def add(self, event_type, article_id=None, slug=None):
+        """追加一条事件，article_id 未知时可只提供 slug，在写入时统一解析"""
+        with self._lock:
+            self._events.append((article_id, slug, event_type, timezone.now()))
+            should_flush = (
+                len(self._events) >= settings.BAIKE_ANALYTICS_BUFFER_SIZE
+                or self._interval_elapsed()
+            )
+        if should_flush:
+            self.flush()
+
+    def _interval_elapsed(self):
+        return time.monotonic() - self._last_flush >= settings.BAIKE_ANALYTICS_FLUSH_INTERVAL
+
+    def flush_if_due(self):
+        """缓冲区非空且超过刷新间隔时写入，返回写入条数"""
+        with self._lock:
+            due = bool(self._events) and self._interval_elapsed()
+        return self.flush() if due else 0
+
+    def flush(self):
+        """将缓冲区事件批量写入数据库，返回写入条数"""
+        with self._lock:
+            pending, self._events = self._events, []
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        slugs = {slug for article_id, slug, _, _ in pending if article_id is None}
+        slug_map = dict(
+            Article.objects.filter(slug__in=slugs).values_list('slug', 'id')
+        ) if slugs else {}
+        resolved = [
+            (article_id or slug_map.get(slug), event_type, created_at)
+            for article_id, slug, event_type, created_at in pending
+        ]
+        article_ids = {article_id for article_id, _, _ in resolved if article_id}
+        category_map = dict(
+            Article.objects.filter(pk__in=article_ids).values_list('id', 'category_id')
+        )
+        events = [
+            ArticleEvent(article_id=article_id, category_id=category_map[article_id],
+                         event_type=event_type, created_at=created_at)
+            for article_id, event_type, created_at in resolved
+            if article_id in category_map
+        ]
+        ArticleEvent.objects.bulk_create(events, batch_size=500)
+        return len(events)
+
+
+event_buffer = EventBuffer()
+atexit.register(event_buffer.flush)
+
+
+def record_event(event_type, article_id=None, slug=None):
+    """记录一次词条行为事件"""
+    event_buffer.add(event_type, article_id=article_id, slug=slug)
+
+
+def _merge_rollups(model, key_field, counts):
+    """把 {(key, date): {字段: 增量}} 累加到每日统计表"""
+    if not counts:
+        return
+    keys = {key for key, _ in counts}
+    dates = {date for _, date in counts}
+    existing = {
+        (getattr(row, key_field), row.date): row
+        for row in model.objects.filter(**{f'{key_field}__in': keys, 'date__in': dates})
+    }
+    to_create, to_update = [], []
+    for (key, date), deltas in counts.items():
+        row = existing.get((key, date))
+        if row is None:
+            to_create.append(model(**{key_field: key, 'date': date}, **deltas))
+            continue
+        for field, delta in deltas.items():
+            setattr(row, field, getattr(row, field) + delta)
+        to_update.append(row)
+    model.objects.bulk_create(to_create, batch_size=500)
+    model.objects.bulk_update(to_update, list(EVENT_FIELDS.values()), batch_size=500)
+
+
+def compact_events(until=None):
+    """
+    将 until 之前的原始事件汇总进每日统计并删除，返回处理的事件数
+
+    汇总与删除在同一事务中完成，结果按增量累加，可重复执行。
+    """
+    until = until or timezone.now()
+    max_id = ArticleEvent.objects.filter(created_at__lt=until).aggregate(
+        max_id=models.Max('id')
+    )['max_id']
+    if max_id is None:
+        return 0
+
+    with transaction.atomic():
+        events = ArticleEvent.objects.filter(id__lte=max_id, created_at__lt=until)
+        rows = events.annotate(day=TruncDate('created_at')).values(
+            'article_id', 'category_id', 'day', 'event_type'
+        ).annotate(total=models.Count('id')).order_by()
+
+        article_counts = defaultdict(lambda: defaultdict(int))
+        category_counts = defaultdict(lambda: defaultdict(int))
+        for row in rows:
+            field = EVENT_FIELDS[row['event_type']]
+            article_counts[(row['article_id'], row['day'])][field] += row['total']
+            if row['category_id']:
+                category_counts[(row['category_id'], row['day'])][field] += row['total']
+
+        existing_categories = set(Category.objects.filter(
+            pk__in={key for key, _ in category_counts}
+        ).values_list('id', flat=True))
+        category_counts = {
+            key: deltas for key, deltas in category_counts.items()
+            if key[0] in existing_categories
+        }
+
+        _merge_rollups(ArticleDailyStat, 'article_id', article_counts)
+        _merge_rollups(CategoryDailyStat, 'category_id', category_counts)
+        deleted, _ = events.delete()
+    return deleted
+
+
+def prune_rollups(keep_days):
+    """删除超过保留天数的每日统计"""
+    cutoff = timezone.localdate() - timedelta(days=keep_days)
+    deleted = ArticleDailyStat.objects.filter(date__lt=cutoff).delete()[0]
+    deleted += CategoryDailyStat.objects.filter(date__lt=cutoff).delete()[0]
+    return deleted
+
+
+def _daily_series(queryset, days):
+    """按日期补零后的时间序列，views_percent 供模板绘制柱状图"""
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    rows = {
+        row['date']: row
+        for row in queryset.filter(date__gte=start).values('date', 'views', 'likes', 'comments')
+    }
+    series = []
+    for offset in range(days):
+        date = start + timedelta(days=offset)
+        row = rows.get(date, {})
+        series.append({
+            'date': date,
+            'views': row.get('views', 0),
+            'likes': row.get('likes', 0),
+            'comments': row.get('comments', 0),
+        })
+    max_views = max(point['views'] for point in series) or 1
+    for point in series:
+        point['views_percent'] = round(point['views'] * 100 / max_views)
+    return series
+
+
+def article_daily_series(article, days=30):
+    """词条最近 days 天的每日统计"""
+    return _daily_series(ArticleDailyStat.objects.filter(article=article), days)
+
+
+def category_daily_series(category, days=30):
+    """分类最近 days 天的每日统计"""
+    return _daily_series(CategoryDailyStat.objects.filter(category=category), days)
@@ -0,0 +1,263 @@
+"""
+只读 JSON API - 百度百科风格项目
+
+支持：
+- fields=title,slug 稀疏字段集，映射为 QuerySet.only()，只查询需要的列
+- slugs=a,b,c 批量获取多个词条
+- cursor 游标分页（按主键倒序的键集分页，翻页代价与页码无关）
+- ETag 条件请求（只依据当前页各行的版本列），数据未变化时直接返回 304
+- 结果流式序列化，大页面不会一次性在内存中拼出完整响应
+"""
+import base64
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import etag, require_GET
+
+from .models import Article, Category, Comment, Tag
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_BATCH_SLUGS = 100
+
+# 对外字段名 -> (only() 所需的模型字段, 取值函数)
+ARTICLE_FIELDS = {
+    'id': (['id'], lambda obj: obj.pk),
+    'title': (['title'], lambda obj: obj.title),
+    'slug': (['slug'], lambda obj: obj.slug),
+    'summary': (['summary'], lambda obj: obj.summary),
+    'content': (['content'], lambda obj: obj.content),
+    'status': (['status'], lambda obj: obj.status),
+    'category': (['category'], lambda obj: obj.category_id),
+    'author': (['author', 'author__username'], lambda obj: obj.author.username),
+    'view_count': (['view_count'], lambda obj: obj.view_count),
+    'like_count': (['like_count'], lambda obj: obj.like_count),
+    'created_at': (['created_at'], lambda obj: obj.created_at),
+    'updated_at': (['updated_at'], lambda obj: obj.updated_at),
+    'published_at': (['published_at'], lambda obj: obj.published_at),
+}
+ARTICLE_DEFAULT_FIELDS = ['id', 'title', 'slug', 'summary', 'category', 'author',
+                          'view_count', 'like_count', 'published_at']
+# ETag 所依据的列：修改时间及不会刷新修改时间的计数字段
+ARTICLE_VERSION_FIELDS = ['updated_at', 'view_count', 'like_count']
+
+CATEGORY_FIELDS = {
+    'id': (['id'], lambda obj: obj.pk),
+    'name': (['name'], lambda obj: obj.name),
+    'description': (['description'], lambda obj: obj.description),
+    'created_at': (['created_at'], lambda obj: obj.created_at),
+    'updated_at': (['updated_at'], lambda obj: obj.updated_at),
+}
+CATEGORY_DEFAULT_FIELDS = ['id', 'name', 'description']
+
+TAG_FIELDS = {
+    'id': (['id'], lambda obj: obj.pk),
+    'name': (['name'], lambda obj: obj.name),
+    'created_at': (['created_at'], lambda obj: obj.created_at),
+}
+TAG_DEFAULT_FIELDS = ['id', 'name']
+
+COMMENT_FIELDS = {
+    'id': (['id'], lambda obj: obj.pk),
+    'article': (['article'], lambda obj: obj.article_id),
+    'author': (['author', 'author__username'], lambda obj: obj.author.username),
+    'content': (['content'], lambda obj: obj.content),
+    'created_at': (['created_at'], lambda obj: obj.created_at),
+    'updated_at': (['updated_at'], lambda obj: obj.updated_at),
+}
+COMMENT_DEFAULT_FIELDS = ['id', 'author', 'content', 'created_at']
+
+
+class ApiError(Exception):
+    """请求参数错误"""
+
+
+def _parse_fields(request, spec, default):
+    """解析 fields 参数，返回对外字段名列表"""
+    raw = request.GET.get('fields')
+    if not raw:
+        return default
+    fields = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in spec]
+    if unknown:
+        raise ApiError(f'未知字段: {", ".join(unknown)}')
+    return fields
+
+
+def _apply_fields(queryset, spec, fields):
+    """按字段集裁剪查询列，关联字段自动 select_related"""
+    only = ['id']
+    related = set()
+    for name in fields:
+        for field in spec[name][0]:
+            only.append(field)
+            if '__' in field:
+                related.add(field.split('__', 1)[0])
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*only)
+
+
+def _encode_cursor(pk):
+    return base64.urlsafe_b64encode(str(pk).encode()).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ApiError('无效的游标')
+
+
+def _page_size(request, default):
+    try:
+        limit = int(request.GET.get('limit', default))
+    except ValueError:
+        raise ApiError('limit 必须是整数')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _stream_page(queryset, spec, fields, limit):
+    """逐行序列化一页结果，最后输出下一页游标"""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    getters = [(name, spec[name][1]) for name in fields]
+    yield '{"results": ['
+    last_pk = None
+    for index, obj in enumerate(queryset[:limit + 1].iterator(chunk_size=MAX_PAGE_SIZE)):
+        if index == limit:
+            break
+        last_pk = obj.pk
+        row = {name: getter(obj) for name, getter in getters}
+        yield (',' if index else '') + encoder.encode(row)
+    else:
+        last_pk = None
+    next_cursor = _encode_cursor(last_pk) if last_pk is not None else None
+    yield '], "next_cursor": ' + json.dumps(next_cursor) + '}'
+
+
+def _page_queryset(request, queryset, default_limit):
+    """按 limit、cursor 参数定位当前页，返回 (按主键倒序的查询集, 每页条数)"""
+    limit = _page_size(request, default_limit)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        queryset = queryset.filter(pk__lt=_decode_cursor(cursor))
+    return queryset.order_by('-pk'), limit
+
+
+def _list_response(request, queryset, spec, default_fields, default_limit=DEFAULT_PAGE_SIZE):
+    """游标分页 + 稀疏字段集的流式列表响应"""
+    try:
+        fields = _parse_fields(request, spec, default_fields)
+        queryset, limit = _page_queryset(request, queryset, default_limit)
+    except ApiError as e:
+        return JsonResponse({'error': str(e)}, status=400,
+                            json_dumps_params={'ensure_ascii': False})
+
+    queryset = _apply_fields(queryset, spec, fields)
+    return StreamingHttpResponse(
+        _stream_page(queryset, spec, fields, limit),
+        content_type='application/json; charset=utf-8',
+    )
+
+
+def _rows_etag(request, rows):
+    """根据结果行的版本列生成 ETag，无需序列化数据"""
+    raw = '|'.join([request.get_full_path()] + [repr(row) for row in rows])
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def _page_etag(request, queryset, version_fields, default_limit=DEFAULT_PAGE_SIZE):
+    """
+    列表页 ETag：只读取本页 limit+1 行（含判断下一页的一行）的主键和版本列，
+    与其他页的数据无关，代价与每页条数成正比
+
+    version_fields 为修改时间及计数字段；计数通过 UPDATE 直接累加、不会刷新修改时间，
+    因此需单独纳入。参数错误时不生成 ETag，由视图返回 400。
+    """
+    try:
+        queryset, limit = _page_queryset(request, queryset, default_limit)
+    except ApiError:
+        return None
+    return _rows_etag(request, queryset.values_list('pk', *version_fields)[:limit + 1])
+
+
+def _slug_list(request):
+    """slugs 参数中的词条别名，最多 MAX_BATCH_SLUGS 个"""
+    slugs = request.GET.get('slugs', '')
+    return [slug.strip() for slug in slugs.split(',') if slug.strip()][:MAX_BATCH_SLUGS]
+
+
+def _article_default_limit(request):
+    """批量获取时默认一页返回全部请求的词条"""
+    return len(_slug_list(request)) or DEFAULT_PAGE_SIZE
+
+
+def _article_queryset(request):
+    """已发布词条，支持 slugs 批量查询和 category 筛选"""
+    queryset = Article.objects.filter(status='published')
+    slug_list = _slug_list(request)
+    if slug_list:
+        queryset = queryset.filter(slug__in=slug_list)
+    category = request.GET.get('category')
+    if category and category.isdigit():
+        queryset = queryset.filter(category_id=category)
+    return queryset
+
+
+def _comment_queryset(slug):
+    """词条的有效评论；跨关联查询不经过 ArticleManager，需显式排除已软删除的词条"""
+    return Comment.objects.filter(
+        article__slug=slug, article__status='published', article__deleted_at__isnull=True,
+        is_active=True,
+    )
+
+
+@require_GET
+@etag(lambda request: _page_etag(
+    request, _article_queryset(request), ARTICLE_VERSION_FIELDS, _article_default_limit(request)))
+def article_list(request):
+    """词条列表 / 批量获取"""
+    return _list_response(request, _article_queryset(request), ARTICLE_FIELDS, ARTICLE_DEFAULT_FIELDS,
+                          default_limit=_article_default_limit(request))
+
+
+@require_GET
+@etag(lambda request, slug: _rows_etag(
+    request,
+    Article.objects.filter(slug=slug, status='published').values_list('pk', *ARTICLE_VERSION_FIELDS),
+))
+def article_detail(request, slug):
+    """单个词条"""
+    try:
+        fields = _parse_fields(request, ARTICLE_FIELDS, list(ARTICLE_FIELDS))
+    except ApiError as e:
+        return JsonResponse({'error': str(e)}, status=400,
+                            json_dumps_params={'ensure_ascii': False})
+    queryset = _apply_fields(Article.objects.filter(status='published'), ARTICLE_FIELDS, fields)
+    article = get_object_or_404(queryset, slug=slug)
+    data = {name: ARTICLE_FIELDS[name][1](article) for name in fields}
+    return JsonResponse(data, json_dumps_params={'ensure_ascii': False})
+
+
+@require_GET
+@etag(lambda request: _page_etag(request, Category.objects.all(), ['updated_at']))
+def category_list(request):
+    """分类列表"""
+    return _list_response(request, Category.objects.all(), CATEGORY_FIELDS, CATEGORY_DEFAULT_FIELDS)
+
+
+@require_GET
+@etag(lambda request: _page_etag(request, Tag.objects.all(), ['created_at']))
+def tag_list(request):
+    """标签列表"""
+    return _list_response(request, Tag.objects.all(), TAG_FIELDS, TAG_DEFAULT_FIELDS)
+
+
+@require_GET
+@etag(lambda request, slug: _page_etag(request, _comment_queryset(slug), ['updated_at']))
+def comment_list(request, slug):
+    """词条评论列表"""
+    return _list_response(request, _comment_queryset(slug), COMMENT_FIELDS, COMMENT_DEFAULT_FIELDS)
@@ -0,0 +1,15 @@
+"""
+应用配置 - 百度百科风格项目
+"""
+from django.apps import AppConfig
+
+
+class BaikeAppConfig(AppConfig):
+    """百科应用配置"""
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'baike_app'
+    verbose_name = '百科'
+
+    def ready(self):
+        """注册信号处理函数"""
+        from . import signals  # noqa: F401
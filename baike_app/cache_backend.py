@@ -0,0 +1,246 @@
+"""
+本机共享缓存后端 - 百度百科风格项目
+
+以 WAL 模式的 SQLite 文件作为缓存存储，同一台机器上的所有 WSGI worker 共享一份
+缓存，无需部署 Redis/Memcached。
+
+- TTL：读取时忽略过期条目，写入时定期清理
+- LRU：记录最近访问时间，条目数超过 MAX_ENTRIES 时淘汰最久未访问的条目
+- incr/decr：在 BEGIN IMMEDIATE 事务中读改写，跨进程原子
+- clear()：递增全局代号（generation），旧代号的条目立即失效并被惰性清理，O(1) 完成
+
+配置示例::
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'baike_app.cache_backend.SQLiteCache',
+            'LOCATION': '/var/tmp/baike-cache.sqlite3',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# 访问时间刷新的最小间隔（秒），避免每次读取都产生一次写入
+ACCESS_TOUCH_INTERVAL = 1.0
+# 每个进程每写入多少次检查一次容量
+CULL_CHECK_INTERVAL = 50
+
+_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS cache_entry ('
+    ' key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL,'
+    ' accessed REAL NOT NULL, generation INTEGER NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed)',
+    'CREATE INDEX IF NOT EXISTS cache_entry_expires ON cache_entry (expires)',
+    'CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)',
+    "INSERT OR IGNORE INTO cache_meta (name, value) VALUES ('generation', 1)",
+]
+
+_CURRENT_GENERATION = "(SELECT value FROM cache_meta WHERE name = 'generation')"
+
+
+class SQLiteCache(BaseCache):
+    """基于 SQLite（WAL 模式）的跨进程共享缓存"""
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = str(location)
+        self._local = threading.local()
+        self._writes = 0
+
+    # 连接管理
+
+    def _connection(self):
+        """每个线程、每个进程各自一条连接（fork 后不复用父进程连接）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=10, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with self._transaction(conn):
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self, conn):
+        """立即获取写锁的事务，保证读改写跨进程原子"""
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+    # 序列化
+
+    def _dumps(self, value):
+        return pickle.dumps(value, self.pickle_protocol)
+
+    def _loads(self, data):
+        return pickle.loads(data)
+
+    # 基本操作
+
+    def _get_row(self, conn, key, now):
+        row = conn.execute(
+            f'SELECT value, accessed FROM cache_entry WHERE key = ?'
+            f' AND generation = {_CURRENT_GENERATION} AND (expires IS NULL OR expires > ?)',
+            (key, now),
+        ).fetchone()
+        return row
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        now = time.time()
+        row = self._get_row(conn, key, now)
+        if row is None:
+            return default
+        if now - row[1] > ACCESS_TOUCH_INTERVAL:
+            conn.execute('UPDATE cache_entry SET accessed = ? WHERE key = ?', (now, key))
+        return self._loads(row[0])
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        conn = self._connection()
+        now = time.time()
+        placeholders = ', '.join(['?'] * len(key_map))
+        rows = conn.execute(
+            f'SELECT key, value FROM cache_entry WHERE key IN ({placeholders})'
+            f' AND generation = {_CURRENT_GENERATION} AND (expires IS NULL OR expires > ?)',
+            [*key_map, now],
+        ).fetchall()
+        return {key_map[key]: self._loads(value) for key, value in rows}
+
+    def _write(self, conn, key, value, timeout, mode):
+        """mode 为 'set' 或 'add'，返回是否写入"""
+        now = time.time()
+        expires = self.get_backend_timeout(timeout)
+        if mode == 'add' and self._get_row(conn, key, now) is not None:
+            return False
+        conn.execute(
+            f'INSERT OR REPLACE INTO cache_entry (key, value, expires, accessed, generation)'
+            f' VALUES (?, ?, ?, ?, {_CURRENT_GENERATION})',
+            (key, self._dumps(value), expires, now),
+        )
+        return True
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        with self._transaction(conn):
+            self._write(conn, key, value, timeout, 'set')
+        self._maybe_cull(conn)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        conn = self._connection()
+        with self._transaction(conn):
+            for key, value in data.items():
+                key = self.make_and_validate_key(key, version=version)
+                self._write(conn, key, value, timeout, 'set')
+        self._maybe_cull(conn)
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        with self._transaction(conn):
+            added = self._write(conn, key, value, timeout, 'add')
+        if added:
+            self._maybe_cull(conn)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        now = time.time()
+        cursor = conn.execute(
+            f'UPDATE cache_entry SET expires = ?, accessed = ? WHERE key = ?'
+            f' AND generation = {_CURRENT_GENERATION} AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), now, key, now),
+        )
+        return cursor.rowcount > 0
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        with self._transaction(conn):
+            row = self._get_row(conn, key, time.time())
+            if row is None:
+                raise ValueError("Key '%s' not found" % key)
+            new_value = self._loads(row[0]) + delta
+            conn.execute('UPDATE cache_entry SET value = ?, accessed = ? WHERE key = ?',
+                         (self._dumps(new_value), time.time(), key))
+        return new_value
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute('DELETE FROM cache_entry WHERE key = ?', (key,))
+        return cursor.rowcount > 0
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        if keys:
+            placeholders = ', '.join(['?'] * len(keys))
+            self._connection().execute(f'DELETE FROM cache_entry WHERE key IN ({placeholders})', keys)
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._get_row(self._connection(), key, time.time()) is not None
+
+    def clear(self):
+        """递增代号使全部条目失效，旧条目在下次清理时删除"""
+        self._connection().execute(
+            "UPDATE cache_meta SET value = value + 1 WHERE name = 'generation'"
+        )
+
+    # 淘汰
+
+    def _maybe_cull(self, conn):
+        self._writes += 1
+        if self._writes % CULL_CHECK_INTERVAL == 0:
+            self.cull(conn)
+
+    def cull(self, conn=None):
+        """删除过期、旧代号的条目；仍超出容量时按最近访问时间淘汰"""
+        conn = conn or self._connection()
+        with self._transaction(conn):
+            conn.execute(
+                f'DELETE FROM cache_entry WHERE (expires IS NOT NULL AND expires <= ?)'
+                f' OR generation <> {_CURRENT_GENERATION}',
+                (time.time(),),
+            )
+            count = conn.execute('SELECT COUNT(*) FROM cache_entry').fetchone()[0]
+            if count > self._max_entries:
+                # 与 Django 内置后端一致：淘汰 1/CULL_FREQUENCY 的条目
+                excess = count - self._max_entries
+                to_remove = max(excess, count // max(self._cull_frequency, 1))
+                conn.execute(
+                    'DELETE FROM cache_entry WHERE key IN ('
+                    ' SELECT key FROM cache_entry ORDER BY accessed LIMIT ?)',
+                    (to_remove,),
+                )
+
+    def close(self, **kwargs):
+        # 连接跨请求复用，请求结束时无需关闭
+        pass
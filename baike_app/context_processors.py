@@ -0,0 +1,29 @@
+"""
+模板上下文处理器 - 百度百科风格项目
+"""
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from .fragment_cache import category_fragment_version
+from .likes import get_liked_set
+
+
+def liked_articles(request):
+    """
+    当前用户点赞过的词条 ID 集合，模板中用 {% if article.pk in liked_article_ids %}
+    判断，整页只需一次缓存读取（缓存缺失时一次查询）
+    """
+    return {
+        'liked_article_ids': SimpleLazyObject(lambda: get_liked_set(request.user)),
+    }
+
+
+def fragment_cache(request):
+    """
+    片段缓存参数：缓存时间和分类片段版本号（惰性读取，
+    未使用分类片段的页面不会访问缓存）
+    """
+    return {
+        'fragment_cache_timeout': settings.BAIKE_FRAGMENT_CACHE_TIMEOUT,
+        'category_fragment_version': SimpleLazyObject(category_fragment_version),
+    }
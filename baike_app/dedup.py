@@ -0,0 +1,148 @@
+"""
+词条近似重复检测 - 百度百科风格项目
+
+对词条内容按字符 k-gram（适合中文等无空格分词的文本）做 MinHash 签名，
+再用 LSH 分段哈希写入桶表。查找近似重复时只需按桶号查询候选词条，
+再用签名估算 Jaccard 相似度，不必扫描全部词条。
+"""
+import hashlib
+import random
+import re
+import struct
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # numpy 仅用于批量计算加速
+    np = None
+
+from .models import ArticleLSHBucket, ArticleSignature
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+DUPLICATE_THRESHOLD = 0.8
+
+# 梅森素数 2^31-1，保证 a*x+b 在 uint64 内不溢出，纯 Python 与 numpy 结果一致
+_PRIME = (1 << 31) - 1
+_rng = random.Random(20231)
+_PERM_A = [_rng.randrange(1, _PRIME) for _ in range(NUM_PERM)]
+_PERM_B = [_rng.randrange(0, _PRIME) for _ in range(NUM_PERM)]
+
+_NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """去除空白和标点后取字符 k-gram，返回哈希值集合"""
+    normalized = _NON_WORD_RE.sub('', text or '').lower()
+    if len(normalized) <= size:
+        grams = {normalized} if normalized else set()
+    else:
+        grams = {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+    return {zlib.crc32(gram.encode('utf-8')) % _PRIME for gram in grams}
+
+
+def minhash(text):
+    """
+    计算单篇文本的 MinHash 签名（长度 NUM_PERM 的整数列表）
+
+    去除标点后没有任何字符的文本返回 None：这类文本的签名全部相同，
+    彼此会被误判为完全重复，不参与近似重复检测。
+    """
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    return [
+        min((a * x + b) % _PRIME for x in hashes)
+        for a, b in zip(_PERM_A, _PERM_B)
+    ]
+
+
+def minhash_many(texts):
+    """
+    批量计算签名，安装了 numpy 时对每篇文本的全部 shingle 向量化计算，
+    否则逐篇回退到 minhash()；无法计算签名的文本对应 None
+    """
+    if np is None:
+        return [minhash(text) for text in texts]
+
+    perm_a = np.array(_PERM_A, dtype=np.uint64)[:, None]
+    perm_b = np.array(_PERM_B, dtype=np.uint64)[:, None]
+    signatures = []
+    for text in texts:
+        hashes = shingles(text)
+        if not hashes:
+            signatures.append(None)
+            continue
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))[None, :]
+        signatures.append(((perm_a * values + perm_b) % _PRIME).min(axis=1).tolist())
+    return signatures
+
+
+def pack_signature(signature):
+    """签名打包为二进制，存入 BinaryField"""
+    return struct.pack(f'<{NUM_PERM}I', *signature)
+
+
+def unpack_signature(data):
+    return list(struct.unpack(f'<{NUM_PERM}I', bytes(data)))
+
+
+def lsh_buckets(signature):
+    """按 BANDS 段切分签名，每段哈希为一个 63 位桶号（段序号参与哈希）"""
+    buckets = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f'<H{ROWS_PER_BAND}I', band, *chunk), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little') >> 1)
+    return buckets
+
+
+def similarity(sig_a, sig_b):
+    """用签名估算两篇文本 shingle 集合的 Jaccard 相似度"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def index_article(article, signature=None):
+    """保存词条签名并重建其 LSH 桶记录，内容无法计算签名时清除旧记录"""
+    if signature is None:
+        signature = minhash(article.content)
+    if signature is None:
+        ArticleSignature.objects.filter(article=article).delete()
+        ArticleLSHBucket.objects.filter(article=article).delete()
+        return
+    ArticleSignature.objects.update_or_create(
+        article=article, defaults={'signature': pack_signature(signature)}
+    )
+    ArticleLSHBucket.objects.filter(article=article).delete()
+    ArticleLSHBucket.objects.bulk_create(
+        ArticleLSHBucket(article=article, bucket=bucket) for bucket in lsh_buckets(signature)
+    )
+
+
+def find_near_duplicates(content, exclude_pk=None, threshold=DUPLICATE_THRESHOLD):
+    """
+    查找与给定内容近似重复的词条
+
+    返回 [(article_id, 相似度)]，按相似度从高到低排序
+    """
+    signature = minhash(content)
+    if signature is None:
+        return []
+    candidates = ArticleLSHBucket.objects.filter(bucket__in=lsh_buckets(signature))
+    if exclude_pk is not None:
+        candidates = candidates.exclude(article_id=exclude_pk)
+    candidate_ids = set(candidates.values_list('article_id', flat=True))
+    if not candidate_ids:
+        return []
+
+    results = []
+    for article_id, data in ArticleSignature.objects.filter(
+        article_id__in=candidate_ids
+    ).values_list('article_id', 'signature'):
+        score = similarity(signature, unpack_signature(data))
+        if score >= threshold:
+            results.append((article_id, score))
+    results.sort(key=lambda item: item[1], reverse=True)
+    return results
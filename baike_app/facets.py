@@ -0,0 +1,88 @@
+"""
+分面搜索统计 - 百度百科风格项目
+
+针对当前搜索词计算各分类、各标签、各状态的命中数：分类与状态共用一条
+GROUP BY (category_id, status) 查询，标签用一条对多对多中间表的分组查询。
+结果按规范化后的搜索词缓存，词条新增/删除/状态变化时随列表依赖标签一起失效，
+搜索字段、分类或标签变化时随 ARTICLE_SEARCH_TAG 失效。
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Article, Tag
+from .page_cache import ARTICLE_LIST_TAG, ARTICLE_SEARCH_TAG, current_versions
+
+FACET_CACHE_KEY = 'baike:facets:{}:{}'
+MAX_TAG_FACETS = 20
+
+
+def normalize_query(query):
+    """去除首尾及多余空白，不改变大小写（SQLite 的 LIKE 只对 ASCII 字母忽略大小写）"""
+    return ' '.join((query or '').split())
+
+
+def _cache_query(normalized):
+    """缓存键使用的搜索词：纯 ASCII 搜索词的大小写不影响匹配结果，统一转小写共享缓存"""
+    return normalized.lower() if normalized.isascii() else normalized
+
+
+def search_filter(query, prefix=''):
+    """搜索词对应的过滤条件，空搜索词不过滤；prefix 用于从关联模型过滤词条（如 'article__'）"""
+    if not query:
+        return Q()
+    return (
+        Q(**{f'{prefix}title__icontains': query}) |
+        Q(**{f'{prefix}content__icontains': query}) |
+        Q(**{f'{prefix}summary__icontains': query})
+    )
+
+
+def compute_facets(query):
+    """计算搜索词的分面统计"""
+    matches = Article.objects.filter(search_filter(query))
+
+    categories = {}
+    statuses = {}
+    for row in matches.values('category_id', 'status').annotate(total=Count('id')).order_by():
+        statuses[row['status']] = statuses.get(row['status'], 0) + row['total']
+        if row['status'] == 'published' and row['category_id'] is not None:
+            categories[row['category_id']] = categories.get(row['category_id'], 0) + row['total']
+
+    # 以连接而非 IN 子查询过滤词条，并只按 tag_id 分组，使查询按中间表
+    # (tag_id, article_id) 唯一索引顺序扫描；排序取前 N 在 Python 中完成，
+    # 避免数据库为分组和排序建临时 B 树
+    tag_counts = Tag.articles.through.objects.filter(
+        search_filter(query, prefix='article__'),
+        article__status='published', article__deleted_at__isnull=True,
+    ).values('tag_id').annotate(total=Count('article_id')).order_by('tag_id')
+    top = sorted(tag_counts, key=lambda row: (-row['total'], row['tag_id']))[:MAX_TAG_FACETS]
+    tags = Tag.objects.in_bulk([row['tag_id'] for row in top])
+
+    return {
+        'categories': categories,
+        'statuses': statuses,
+        'tags': sorted(
+            (
+                {'id': row['tag_id'], 'name': tags[row['tag_id']].name, 'count': row['total']}
+                for row in top if row['tag_id'] in tags
+            ),
+            key=lambda facet: (-facet['count'], facet['name']),
+        ),
+    }
+
+
+def get_facets(query):
+    """读取或计算分面统计，按规范化搜索词缓存"""
+    normalized = normalize_query(query)
+    versions = current_versions([ARTICLE_LIST_TAG, ARTICLE_SEARCH_TAG])
+    version = f'{versions[ARTICLE_LIST_TAG]}.{versions[ARTICLE_SEARCH_TAG]}'
+    digest = hashlib.md5(_cache_query(normalized).encode('utf-8')).hexdigest()
+    key = FACET_CACHE_KEY.format(version, digest)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(normalized)
+        cache.set(key, facets, settings.BAIKE_FACET_CACHE_TIMEOUT)
+    return facets
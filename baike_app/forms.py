@@ -1,13 +1,30 @@
 """
 表单定义 - 百度百科风格项目
 """
+import re
+
 from django import forms
 from django.core.exceptions import ValidationError
-from .models import Article, Comment, Category
+from django.db import transaction
+from .dedup import find_near_duplicates
+from .models import Article, Comment, Category, Tag
+from .page_cache import ARTICLE_SEARCH_TAG, invalidate_tags
 
 
 class ArticleForm(forms.ModelForm):
     """词条表单"""
+    MAX_TAGS = 50
+    
+    tags = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': '例如：Python, Web开发, 编程'
+        }),
+        label='标签',
+        help_text='多个标签用逗号分隔，不存在的标签会自动创建'
+    )
+    
     class Meta:
         model = Article
         fields = ['title', 'slug', 'category', 'summary', 'content', 'status']
@@ -50,6 +67,13 @@ class ArticleForm(forms.ModelForm):
             'summary': '简要描述词条内容，将在列表页显示',
         }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['tags'].initial = ', '.join(
+                self.instance.tags.values_list('name', flat=True)
+            )
+    
     def clean_slug(self):
         """验证slug字段"""
         slug = self.cleaned_data.get('slug')
@@ -57,16 +81,15 @@ class ArticleForm(forms.ModelForm):
             raise ValidationError('URL标识不能为空')
         
         # 检查slug是否只包含允许的字符
-        import re
         if not re.match(r'^[a-zA-Z0-9_-]+$', slug):
             raise ValidationError('URL标识只能包含字母、数字、连字符和下划线')
         
-        # 检查slug是否唯一（排除当前实例）
+        # 检查slug是否唯一（排除当前实例，已软删除但未清理的词条仍占用标识）
         if self.instance and self.instance.pk:
-            if Article.objects.filter(slug=slug).exclude(pk=self.instance.pk).exists():
+            if Article.all_objects.filter(slug=slug).exclude(pk=self.instance.pk).exists():
                 raise ValidationError('该URL标识已被使用，请选择其他标识')
         else:
-            if Article.objects.filter(slug=slug).exists():
+            if Article.all_objects.filter(slug=slug).exists():
                 raise ValidationError('该URL标识已被使用，请选择其他标识')
         
         return slug
@@ -76,7 +99,60 @@ class ArticleForm(forms.ModelForm):
         content = self.cleaned_data.get('content')
         if not content or len(content.strip()) < 10:
             raise ValidationError('词条内容不能少于10个字符')
+        
+        # 检查是否与已有词条内容近似重复（排除当前实例）
+        duplicates = find_near_duplicates(content, exclude_pk=self.instance.pk)
+        if duplicates:
+            existing = Article.objects.only('title').in_bulk([article_id for article_id, _ in duplicates])
+            for article_id, score in duplicates:
+                if article_id in existing:
+                    raise ValidationError(
+                        f'内容与已有词条《{existing[article_id].title}》高度相似（相似度 {score:.0%}），请勿重复创建'
+                    )
         return content
+    
+    def clean_tags(self):
+        """解析逗号分隔的标签，去重并保持输入顺序"""
+        raw = self.cleaned_data.get('tags') or ''
+        names = []
+        for name in re.split(r'[,，]', raw):
+            name = name.strip()
+            if not name or name in names:
+                continue
+            if len(name) > Tag._meta.get_field('name').max_length:
+                raise ValidationError(f'标签“{name}”过长')
+            names.append(name)
+        if len(names) > self.MAX_TAGS:
+            raise ValidationError(f'标签不能超过{self.MAX_TAGS}个')
+        return names
+    
+    def _save_m2m(self):
+        """保存多对多关系时一并保存标签，查询次数与标签数量无关，整体在一个事务中完成"""
+        with transaction.atomic():
+            super()._save_m2m()
+            names = self.cleaned_data.get('tags', [])
+            through = Tag.articles.through
+            links = through.objects.filter(article_id=self.instance.pk)
+            
+            # 一次批量插入补齐不存在的标签，再一次查询取回全部标签
+            Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+            tag_ids = {tag.pk for tag in Tag.objects.in_bulk(names, field_name='name').values()}
+            current_ids = set(links.values_list('tag_id', flat=True))
+            
+            # 删除移除的关联，批量写入新增的关联
+            removed_ids = current_ids - tag_ids
+            added_ids = tag_ids - current_ids
+            if removed_ids:
+                links.filter(tag_id__in=removed_ids).delete()
+            if added_ids:
+                through.objects.bulk_create(
+                    [through(article_id=self.instance.pk, tag_id=tag_id) for tag_id in added_ids],
+                    ignore_conflicts=True,
+                )
+            
+            # bulk_create 不发送信号，需自行使标签分面统计失效
+            if removed_ids or added_ids:
+                transaction.on_commit(lambda: invalidate_tags(ARTICLE_SEARCH_TAG))
 
 
 class CommentForm(forms.ModelForm):
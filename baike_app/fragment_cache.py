@@ -0,0 +1,29 @@
+"""
+页面公共部分缓存 - 百度百科风格项目
+
+导航栏、页脚、分类侧栏等每个页面都会渲染的公共部分使用 {% cache %} 片段缓存，
+分类相关片段以分类列表的依赖标签版本号作为缓存键的一部分，分类保存或删除时
+版本号变化，片段随之失效。
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Category
+from .page_cache import CATEGORY_LIST_TAG, get_tag_version
+
+CATEGORY_LIST_KEY = 'baike:categories:{}'
+
+
+def category_fragment_version():
+    """分类片段当前版本号"""
+    return get_tag_version(CATEGORY_LIST_TAG)
+
+
+def cached_categories():
+    """按版本号缓存的全部分类列表，分类变化后自动重新查询"""
+    key = CATEGORY_LIST_KEY.format(category_fragment_version())
+    categories = cache.get(key)
+    if categories is None:
+        categories = list(Category.objects.all())
+        cache.set(key, categories, settings.BAIKE_FRAGMENT_CACHE_TIMEOUT)
+    return categories
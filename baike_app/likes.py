@@ -0,0 +1,66 @@
+"""
+用户点赞状态服务 - 百度百科风格项目
+
+每个用户点赞过的词条 ID 以有序紧凑整数数组缓存，列表页一次读取即可判断整页
+词条的点赞状态，不再逐条查询 Like 表。点赞变化时在事务提交后删除缓存，
+下次读取用一条查询重建，不做读改写，并发点赞或事务回滚都不会留下错误状态。
+"""
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Like
+
+LIKED_SET_KEY = 'baike:liked:{}'
+
+
+class LikedSet:
+    """有序词条 ID 数组，支持 in 判断"""
+
+    def __init__(self, ids=()):
+        self._ids = array('q', sorted(ids))
+
+    def __contains__(self, article_id):
+        index = bisect_left(self._ids, article_id)
+        return index < len(self._ids) and self._ids[index] == article_id
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def to_bytes(self):
+        return self._ids.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data):
+        liked = cls()
+        liked._ids.frombytes(data)
+        return liked
+
+
+def get_liked_set(user):
+    """获取用户点赞过的词条集合，匿名用户返回空集合"""
+    if not user.is_authenticated:
+        return LikedSet()
+    key = LIKED_SET_KEY.format(user.pk)
+    data = cache.get(key)
+    if data is not None:
+        return LikedSet.from_bytes(data)
+    liked = LikedSet(Like.objects.filter(user_id=user.pk).values_list('article_id', flat=True))
+    cache.set(key, liked.to_bytes(), settings.BAIKE_LIKED_SET_TIMEOUT)
+    return liked
+
+
+def liked_article_ids(user, article_ids):
+    """返回 article_ids 中用户已点赞的词条 ID 集合"""
+    liked = get_liked_set(user)
+    return {article_id for article_id in article_ids if article_id in liked}
+
+
+def invalidate_liked_set(user_id):
+    """删除用户点赞集合缓存，下次读取时重建"""
+    cache.delete(LIKED_SET_KEY.format(user_id))
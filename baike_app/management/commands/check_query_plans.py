@@ -0,0 +1,146 @@
+"""
+视图查询计划回归检查
+
+    python manage.py check_query_plans [--articles 500]
+
+在临时测试数据库（与 manage.py test 相同方式创建、执行迁移）中写入一批测试数据，
+依次请求各热点视图并记录其 SQL，对每条查询执行 EXPLAIN QUERY PLAN。出现全表扫描
+（SCAN 且未使用索引）或临时 B 树排序（USE TEMP B-TREE）即判定为回归并以非零状态退出。
+
+检查期间使用独立的进程内缓存，每个视图请求前清空，保证视图的全部查询都被检查，
+且不会把测试数据写入线上缓存；线上数据库文件不会被写入或加锁。
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_databases, teardown_databases,
+)
+
+from baike_app import analytics
+from baike_app.models import Article, Category, Comment, Like, Tag
+
+# 这些表的查询不纳入检查（会话、用户等框架表按主键访问，不属于本应用热点查询）
+IGNORED_TABLES = ('django_session', 'auth_user')
+
+CHECK_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'check-query-plans'},
+}
+
+
+def _plan_problems(sql):
+    """返回查询计划中的问题描述列表"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        details = [row[-1] for row in cursor.fetchall()]
+    problems = []
+    for detail in details:
+        if detail.startswith('SCAN') and 'USING' not in detail:
+            problems.append(detail)
+        elif 'USE TEMP B-TREE' in detail:
+            problems.append(detail)
+    return problems
+
+
+class Command(BaseCommand):
+    help = '对各视图查询执行 EXPLAIN QUERY PLAN，发现全表扫描或临时排序时失败'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=500,
+                            help='写入的测试词条数量')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('查询计划检查仅支持 SQLite')
+
+        failures = []
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=['testserver'], CACHES=CHECK_CACHES,
+                BAIKE_PAGE_CACHE_ENABLED=False, BAIKE_THROTTLE_ENABLED=False,
+            ):
+                cache.clear()
+                urls, user = self._seed(options['articles'])
+                client = Client()
+                client.force_login(user)
+                for name, url in urls:
+                    failures.extend(self._check_view(client, name, url))
+                analytics.event_buffer.flush()
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        if failures:
+            for name, sql, problems in failures:
+                self.stdout.write(self.style.ERROR(f'[{name}] {"; ".join(problems)}'))
+                self.stdout.write(f'    {sql}')
+            raise CommandError(f'发现 {len(failures)} 条查询计划回归')
+        self.stdout.write(self.style.SUCCESS('所有视图查询均走索引'))
+
+    def _seed(self, article_count):
+        """写入测试数据并收集 ANALYZE 统计信息"""
+        user = User.objects.create_user('query-plan-checker')
+        authors = User.objects.bulk_create(
+            User(username=f'query-plan-author-{i}') for i in range(50)
+        )
+        categories = Category.objects.bulk_create(
+            Category(name=f'查询计划分类{i}') for i in range(10)
+        )
+        Article.objects.bulk_create(
+            Article(
+                title=f'查询计划词条{i}', slug=f'query-plan-{i}', content='内容' * 20,
+                author=authors[i % len(authors)], category=categories[i % len(categories)],
+                status='published' if i % 4 else 'draft', view_count=i,
+            )
+            for i in range(article_count)
+        )
+        tags = Tag.objects.bulk_create(Tag(name=f'查询计划标签{i}') for i in range(200))
+        Tag.articles.through.objects.bulk_create(
+            Tag.articles.through(tag_id=tags[(article.pk + offset) % len(tags)].pk, article_id=article.pk)
+            for article in Article.objects.only('id') for offset in range(3)
+        )
+        article = Article.objects.filter(status='published').first()
+        Comment.objects.bulk_create(
+            Comment(article=article, author=authors[i % len(authors)], content='评论') for i in range(20)
+        )
+        Like.objects.create(article=article, user=user)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        category = categories[1]
+        urls = [
+            ('home', '/'),
+            ('article_list', '/articles/'),
+            ('article_list_page', '/articles/?page=3'),
+            ('article_list_search', '/articles/?q=词条1'),
+            ('article_list_category', f'/articles/?category={category.pk}'),
+            ('article_list_tag', f'/articles/?tag={tags[1].pk}'),
+            ('article_list_category_page', f'/articles/?category={category.pk}&page=2'),
+            ('article_detail', f'/articles/{article.slug}/'),
+            ('category_list', '/categories/'),
+            ('category_detail', f'/categories/{category.pk}/'),
+            ('category_detail_page', f'/categories/{category.pk}/?page=2'),
+        ]
+        return urls, user
+
+    def _check_view(self, client, name, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f'[{name}] {url} 返回 {response.status_code}')
+
+        failures = []
+        for query in queries:
+            sql = query['sql']
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            if any(f'"{table}"' in sql for table in IGNORED_TABLES) and 'baike_app_' not in sql:
+                continue
+            problems = _plan_problems(sql)
+            if problems:
+                failures.append((name, sql, problems))
+        self.stdout.write(f'[{name}] 检查 {len(queries)} 条查询')
+        return failures
@@ -0,0 +1,115 @@
+"""
+批量计算词条签名并聚类近似重复词条
+
+    python manage.py cluster_duplicates [--threshold 0.8] [--batch-size 500] [--dry-run]
+"""
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from baike_app import dedup
+from baike_app.models import Article, ArticleLSHBucket, ArticleSignature
+
+
+class Command(BaseCommand):
+    help = '重建全部词条的 MinHash 签名和 LSH 桶，并输出近似重复词条分组'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=dedup.DUPLICATE_THRESHOLD,
+                            help='判定为近似重复的相似度阈值')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='每批读取和写入的词条数')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='只聚类输出，不写入签名表')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        batch_size = options['batch_size']
+        signatures = {}
+        titles = {}
+
+        queryset = Article.objects.only('id', 'title', 'content').order_by('pk')
+        batch = []
+        for article in queryset.iterator(chunk_size=batch_size):
+            batch.append(article)
+            if len(batch) >= batch_size:
+                self._process_batch(batch, signatures, titles, options['dry_run'])
+                batch = []
+        if batch:
+            self._process_batch(batch, signatures, titles, options['dry_run'])
+
+        engine = 'numpy' if dedup.np is not None else '纯 Python'
+        self.stdout.write(
+            f'已计算 {len(signatures)} 篇词条签名（{engine}），耗时 {time.monotonic() - started:.2f}s'
+        )
+
+        clusters = self._cluster(signatures, options['threshold'])
+        if not clusters:
+            self.stdout.write(self.style.SUCCESS('未发现近似重复词条'))
+            return
+        for index, members in enumerate(clusters, 1):
+            self.stdout.write(self.style.WARNING(f'第 {index} 组（{len(members)} 篇）:'))
+            for article_id in members:
+                self.stdout.write(f'  [{article_id}] {titles[article_id]}')
+
+    def _process_batch(self, batch, signatures, titles, dry_run):
+        """批量计算签名，必要时整批替换签名和桶记录；无法计算签名的词条不参与聚类"""
+        batch_signatures = dedup.minhash_many([article.content for article in batch])
+        indexed = []
+        for article, signature in zip(batch, batch_signatures):
+            if signature is None:
+                continue
+            indexed.append((article.pk, signature))
+            signatures[article.pk] = signature
+            titles[article.pk] = article.title
+        if dry_run:
+            return
+
+        ids = [article.pk for article in batch]
+        with transaction.atomic():
+            ArticleSignature.objects.filter(article_id__in=ids).delete()
+            ArticleLSHBucket.objects.filter(article_id__in=ids).delete()
+            ArticleSignature.objects.bulk_create(
+                ArticleSignature(article_id=pk, signature=dedup.pack_signature(sig))
+                for pk, sig in indexed
+            )
+            ArticleLSHBucket.objects.bulk_create(
+                ArticleLSHBucket(article_id=pk, bucket=bucket)
+                for pk, sig in indexed
+                for bucket in dedup.lsh_buckets(sig)
+            )
+
+    def _cluster(self, signatures, threshold):
+        """同桶词条两两比较签名，用并查集合并相似词条"""
+        buckets = defaultdict(list)
+        for article_id, signature in signatures.items():
+            for bucket in dedup.lsh_buckets(signature):
+                buckets[bucket].append(article_id)
+
+        parent = {article_id: article_id for article_id in signatures}
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        compared = set()
+        for members in buckets.values():
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    if (a, b) in compared:
+                        continue
+                    compared.add((a, b))
+                    if dedup.similarity(signatures[a], signatures[b]) >= threshold:
+                        parent[find(a)] = find(b)
+
+        groups = defaultdict(list)
+        for article_id in signatures:
+            groups[find(article_id)].append(article_id)
+        return sorted(
+            (sorted(members) for members in groups.values() if len(members) > 1),
+            key=len, reverse=True,
+        )
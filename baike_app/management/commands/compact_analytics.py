@@ -0,0 +1,25 @@
+"""
+汇总词条行为事件为每日统计
+
+    python manage.py compact_analytics [--keep-days 365]
+
+建议通过 cron 每隔几分钟执行一次。
+"""
+from django.core.management.base import BaseCommand
+
+from baike_app import analytics
+
+
+class Command(BaseCommand):
+    help = '把原始行为事件汇总为词条/分类每日统计，并清理过期数据'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-days', type=int, default=365,
+                            help='每日统计保留天数')
+
+    def handle(self, *args, **options):
+        compacted = analytics.compact_events()
+        pruned = analytics.prune_rollups(options['keep_days'])
+        self.stdout.write(self.style.SUCCESS(
+            f'汇总事件 {compacted} 条，清理过期统计 {pruned} 行'
+        ))
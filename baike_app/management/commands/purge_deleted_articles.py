@@ -0,0 +1,98 @@
+"""
+清理已软删除的词条及其关联数据
+
+    python manage.py purge_deleted_articles [--older-than-minutes 0] [--batch-size 1000]
+
+关联行用原生 DELETE 按主键分批删除，不加载对象也不发送信号，每批一个短事务，
+不会长时间占用 SQLite 写锁。建议通过 cron 定期执行。
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from baike_app.models import Article, ArticleImage
+
+# 每轮处理的词条数，控制 IN 子句参数个数不超过 SQLite 上限
+ARTICLE_CHUNK_SIZE = 500
+
+
+def _article_relations():
+    """找出所有引用词条的表及外键列（含多对多中间表）"""
+    relations = []
+    for rel in Article._meta.related_objects:
+        if rel.many_to_many:
+            through = rel.through
+            column = next(
+                field.column for field in through._meta.fields
+                if field.is_relation and field.related_model is Article
+            )
+            relations.append((through, column))
+        else:
+            relations.append((rel.related_model, rel.field.column))
+    return relations
+
+
+class Command(BaseCommand):
+    help = '分批清理已软删除的词条、评论、点赞、图片（含文件）和标签关联'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-minutes', type=int, default=0,
+                            help='只清理删除超过指定分钟数的词条')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='每个事务删除的最大行数')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        cutoff = timezone.now() - timedelta(minutes=options['older_than_minutes'])
+        article_ids = list(
+            Article.all_objects.filter(deleted_at__lte=cutoff).values_list('id', flat=True)
+        )
+        if not article_ids:
+            self.stdout.write('没有需要清理的词条')
+            return
+
+        started = time.monotonic()
+        for start in range(0, len(article_ids), ARTICLE_CHUNK_SIZE):
+            chunk = article_ids[start:start + ARTICLE_CHUNK_SIZE]
+            self._delete_image_files(chunk)
+            for model, column in _article_relations():
+                deleted = self._delete_in_batches(model, column, chunk, batch_size)
+                if deleted:
+                    self.stdout.write(f'  {model._meta.db_table}: 删除 {deleted} 行')
+            self._delete_in_batches(Article, 'id', chunk, batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'已清理 {len(article_ids)} 个词条，耗时 {time.monotonic() - started:.2f}s'
+        ))
+
+    def _delete_in_batches(self, model, column, article_ids, batch_size):
+        """按主键分批原生删除 column 属于 article_ids 的行"""
+        table = connection.ops.quote_name(model._meta.db_table)
+        pk_column = connection.ops.quote_name(model._meta.pk.column)
+        fk_column = connection.ops.quote_name(column)
+        placeholders = ', '.join(['%s'] * len(article_ids))
+        total = 0
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f'SELECT {pk_column} FROM {table} WHERE {fk_column} IN ({placeholders}) LIMIT %s',
+                    [*article_ids, batch_size],
+                )
+                pks = [row[0] for row in cursor.fetchall()]
+                if not pks:
+                    return total
+                cursor.execute(
+                    f'DELETE FROM {table} WHERE {pk_column} IN ({", ".join(["%s"] * len(pks))})',
+                    pks,
+                )
+                total += len(pks)
+
+    def _delete_image_files(self, article_ids):
+        """删除词条图片文件，数据库记录随后由批量删除清理"""
+        storage = ArticleImage._meta.get_field('image').storage
+        for name in ArticleImage.objects.filter(article_id__in=article_ids).values_list('image', flat=True):
+            if name and storage.exists(name):
+                storage.delete(name)
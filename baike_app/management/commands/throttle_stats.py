@@ -0,0 +1,22 @@
+"""
+查看写接口限流统计
+
+    python manage.py throttle_stats
+
+输出各接口自计数开始以来被限流（返回 429）的请求数。
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from baike_app.throttling import throttled_counts
+
+
+class Command(BaseCommand):
+    help = '输出各写接口被限流的请求数'
+
+    def handle(self, *args, **options):
+        state = '启用' if settings.BAIKE_THROTTLE_ENABLED else '未启用'
+        self.stdout.write(f'限流{state}')
+        for scope, count in throttled_counts().items():
+            rates = ', '.join(f'{kind} {rate}' for kind, rate in settings.BAIKE_THROTTLE_RATES[scope].items())
+            self.stdout.write(f'  {scope}（{rates}）: 被限流 {count} 次')
@@ -0,0 +1,40 @@
+"""
+部署后预热
+
+    python manage.py warmup [--top 20] [--host example.com] [--skip-pages]
+
+预加载 URL 解析器与模板，并以匿名身份请求首页、分类列表及按浏览量排名前 N 的
+词条和分类页面，写入本机共享的整页缓存与片段缓存。逐步输出耗时。
+预热请求不计入浏览次数和行为统计。
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from baike_app.warmup import warm_process, warm_shared_caches
+
+
+class Command(BaseCommand):
+    help = '预热 URL 解析器、模板和热门页面缓存，并输出各步骤耗时'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20,
+                            help='预热浏览量排名前 N 的词条和分类')
+        parser.add_argument('--host', default=None,
+                            help='预热请求使用的 Host（需在 ALLOWED_HOSTS 中），默认取其中第一个域名')
+        parser.add_argument('--skip-pages', action='store_true',
+                            help='只执行进程内预热，不请求页面')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        timings = warm_process()
+        if not options['skip_pages']:
+            timings += warm_shared_caches(top_n=options['top'], host=options['host'])
+
+        for name, seconds, result in timings:
+            if isinstance(result, list):
+                result = len(result)
+            self.stdout.write(f'  {name}: {seconds * 1000:.1f}ms ({result})')
+        self.stdout.write(self.style.SUCCESS(
+            f'预热完成，耗时 {time.monotonic() - started:.2f}s'
+        ))
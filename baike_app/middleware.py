@@ -0,0 +1,69 @@
+"""
+中间件定义 - 百度百科风格项目
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+USER_CACHE_KEY = 'baike:user:{}'
+
+
+def user_cache_key(user_id):
+    """已登录用户对象的缓存键"""
+    return USER_CACHE_KEY.format(user_id)
+
+
+def get_cached_user(request):
+    """
+    与 django.contrib.auth.get_user 等价，但用户对象优先从缓存读取，
+    命中时省去每个请求一次的 User 查询
+    """
+    from django.contrib.auth.models import AnonymousUser
+
+    try:
+        user_id = auth._get_user_session_key(request)
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+
+    backend = auth.load_backend(backend_path)
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = backend.get_user(user_id)
+        if user is None:
+            return AnonymousUser()
+        cache.set(key, user, settings.BAIKE_USER_CACHE_TIMEOUT)
+    elif hasattr(backend, 'user_can_authenticate') and not backend.user_can_authenticate(user):
+        return AnonymousUser()
+
+    # 校验会话哈希，修改密码后旧会话依然失效
+    if hasattr(user, 'get_session_auth_hash'):
+        session_hash = request.session.get(auth.HASH_SESSION_KEY)
+        session_auth_hash = user.get_session_auth_hash()
+        if not session_hash or not constant_time_compare(session_hash, session_auth_hash):
+            if session_hash and any(
+                constant_time_compare(session_hash, fallback_hash)
+                for fallback_hash in user.get_session_auth_fallback_hash()
+            ):
+                request.session.cycle_key()
+                request.session[auth.HASH_SESSION_KEY] = session_auth_hash
+            else:
+                request.session.flush()
+                return AnonymousUser()
+
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """使用用户缓存的认证中间件，替代 django 自带的 AuthenticationMiddleware"""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
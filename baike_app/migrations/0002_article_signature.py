@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('baike_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleSignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.BinaryField(verbose_name='MinHash签名')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='signature', to='baike_app.article', verbose_name='所属词条')),
+            ],
+            options={
+                'verbose_name': '词条签名',
+                'verbose_name_plural': '词条签名',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArticleLSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(verbose_name='桶号')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='baike_app.article', verbose_name='所属词条')),
+            ],
+            options={
+                'verbose_name': 'LSH桶',
+                'verbose_name_plural': 'LSH桶',
+                'indexes': [models.Index(fields=['bucket'], name='baike_app_a_bucket_9513f0_idx')],
+            },
+        ),
+    ]
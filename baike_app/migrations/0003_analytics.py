@@ -0,0 +1,60 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('baike_app', '0002_article_signature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category_id', models.BigIntegerField(blank=True, null=True, verbose_name='分类ID')),
+                ('event_type', models.CharField(choices=[('view', '浏览'), ('like', '点赞'), ('comment', '评论')], max_length=10, verbose_name='事件类型')),
+                ('created_at', models.DateTimeField(verbose_name='发生时间')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='baike_app.article', verbose_name='所属词条')),
+            ],
+            options={
+                'verbose_name': '词条事件',
+                'verbose_name_plural': '词条事件',
+            },
+        ),
+        migrations.CreateModel(
+            name='CategoryDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='日期')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='浏览数')),
+                ('likes', models.PositiveIntegerField(default=0, verbose_name='点赞数')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='评论数')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='baike_app.category', verbose_name='所属分类')),
+            ],
+            options={
+                'verbose_name': '分类每日统计',
+                'verbose_name_plural': '分类每日统计',
+                'unique_together': {('category', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ArticleDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='日期')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='浏览数')),
+                ('likes', models.PositiveIntegerField(default=0, verbose_name='点赞数')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='评论数')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='baike_app.article', verbose_name='所属词条')),
+            ],
+            options={
+                'verbose_name': '词条每日统计',
+                'verbose_name_plural': '词条每日统计',
+                'unique_together': {('article', 'date')},
+            },
+        ),
+    ]
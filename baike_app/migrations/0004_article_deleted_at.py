@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('baike_app', '0003_analytics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='删除时间'),
+        ),
+    ]
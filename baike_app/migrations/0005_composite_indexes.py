@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('baike_app', '0004_article_deleted_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='article',
+            name='baike_app_a_status_ea0bf3_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='article',
+            name='baike_app_a_categor_81052c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['status', '-created_at'], name='article_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['status', '-view_count'], name='article_status_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['category', 'status', '-created_at'], name='article_cat_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['category', 'status', '-view_count'], name='article_cat_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['name'], name='category_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['article', '-created_at'], name='comment_article_active_idx'),
+        ),
+    ]
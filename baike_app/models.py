@@ -1,6 +1,8 @@
 """
 数据模型定义 - 百度百科风格项目
 """
+import hashlib
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -18,6 +20,9 @@ class Category(models.Model):
         verbose_name = '分类'
         verbose_name_plural = '分类'
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['name'], name='category_name_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -26,6 +31,13 @@ class Category(models.Model):
         return reverse('category_detail', kwargs={'pk': self.pk})
 
 
+class ArticleManager(models.Manager):
+    """默认管理器，排除已软删除的词条"""
+    
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Article(models.Model):
     """百科词条模型"""
     STATUS_CHOICES = [
@@ -55,14 +67,31 @@ class Article(models.Model):
     view_count = models.PositiveIntegerField(default=0, verbose_name='浏览次数')
     like_count = models.PositiveIntegerField(default=0, verbose_name='点赞数')
     
+    # 软删除时间，由 purge_deleted_articles 命令异步清理
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True, verbose_name='删除时间')
+    
+    objects = ArticleManager()
+    all_objects = models.Manager()
+    
+    # 参与搜索的字段，变化时搜索分面统计需要失效
+    SEARCH_FIELDS = ('title', 'summary', 'content')
+    
     class Meta:
         verbose_name = '词条'
         verbose_name_plural = '词条'
         ordering = ['-created_at']
+        # 热点查询均为“已发布且未删除”的词条按时间或浏览量倒序，可选按分类筛选，
+        # 使用部分索引（deleted_at IS NULL），排序直接走索引，无需临时 B 树
         indexes = [
             models.Index(fields=['-created_at']),
-            models.Index(fields=['status']),
-            models.Index(fields=['category']),
+            models.Index(fields=['status', '-created_at'], name='article_status_created_idx',
+                         condition=models.Q(deleted_at__isnull=True)),
+            models.Index(fields=['status', '-view_count'], name='article_status_views_idx',
+                         condition=models.Q(deleted_at__isnull=True)),
+            models.Index(fields=['category', 'status', '-created_at'], name='article_cat_created_idx',
+                         condition=models.Q(deleted_at__isnull=True)),
+            models.Index(fields=['category', 'status', '-view_count'], name='article_cat_views_idx',
+                         condition=models.Q(deleted_at__isnull=True)),
         ]
     
     def __str__(self):
@@ -71,11 +100,35 @@ class Article(models.Model):
     def get_absolute_url(self):
         return reverse('article_detail', kwargs={'slug': self.slug})
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """记录从数据库读取时的状态、分类和搜索字段摘要，供缓存失效判断使用"""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_status = loaded.get('status')
+        instance._loaded_category_id = loaded.get('category_id')
+        if all(name in loaded for name in cls.SEARCH_FIELDS):
+            instance._loaded_search_digest = cls._digest(loaded[name] for name in cls.SEARCH_FIELDS)
+        return instance
+    
+    @staticmethod
+    def _digest(values):
+        return hashlib.md5('\0'.join(values).encode('utf-8')).digest()
+    
+    def search_digest(self):
+        """当前搜索字段内容的摘要"""
+        return self._digest(getattr(self, name) for name in self.SEARCH_FIELDS)
+    
     def save(self, *args, **kwargs):
         """保存时自动设置发布时间"""
         if self.status == 'published' and not self.published_at:
             self.published_at = timezone.now()
         super().save(*args, **kwargs)
+    
+    def soft_delete(self):
+        """软删除：只标记删除时间，关联数据由后台清理"""
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at'])
 
 
 class ArticleImage(models.Model):
@@ -124,6 +177,10 @@ class Comment(models.Model):
         verbose_name = '评论'
         verbose_name_plural = '评论'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['article', '-created_at'], name='comment_article_active_idx',
+                         condition=models.Q(is_active=True)),
+        ]
     
     def __str__(self):
         return f"{self.author.username} 对 {self.article.title} 的评论"
@@ -142,4 +199,94 @@ class Like(models.Model):
         unique_together = ['article', 'user']
     
     def __str__(self):
-        return f"{self.user.username} 点赞了 {self.article.title}"
\ No newline at end of file
+        return f"{self.user.username} 点赞了 {self.article.title}"
+
+
+class ArticleSignature(models.Model):
+    """词条内容 MinHash 签名，用于近似重复检测"""
+    article = models.OneToOneField(Article, on_delete=models.CASCADE,
+                                   related_name='signature', verbose_name='所属词条')
+    signature = models.BinaryField(verbose_name='MinHash签名')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+    
+    class Meta:
+        verbose_name = '词条签名'
+        verbose_name_plural = '词条签名'
+    
+    def __str__(self):
+        return f"{self.article_id} 的签名"
+
+
+class ArticleLSHBucket(models.Model):
+    """词条 LSH 桶记录，同一桶内的词条为近似重复候选"""
+    article = models.ForeignKey(Article, on_delete=models.CASCADE,
+                                related_name='lsh_buckets', verbose_name='所属词条')
+    bucket = models.BigIntegerField(verbose_name='桶号')
+    
+    class Meta:
+        verbose_name = 'LSH桶'
+        verbose_name_plural = 'LSH桶'
+        indexes = [
+            models.Index(fields=['bucket']),
+        ]
+    
+    def __str__(self):
+        return f"{self.article_id} -> {self.bucket}"
+
+
+class ArticleEvent(models.Model):
+    """词条原始行为事件，定期汇总为每日统计后删除"""
+    EVENT_CHOICES = [
+        ('view', '浏览'),
+        ('like', '点赞'),
+        ('comment', '评论'),
+    ]
+    
+    article = models.ForeignKey(Article, on_delete=models.CASCADE,
+                                related_name='events', verbose_name='所属词条')
+    category_id = models.BigIntegerField(null=True, blank=True, verbose_name='分类ID')
+    event_type = models.CharField(max_length=10, choices=EVENT_CHOICES, verbose_name='事件类型')
+    created_at = models.DateTimeField(verbose_name='发生时间')
+    
+    class Meta:
+        verbose_name = '词条事件'
+        verbose_name_plural = '词条事件'
+    
+    def __str__(self):
+        return f"{self.article_id} {self.event_type} @ {self.created_at}"
+
+
+class ArticleDailyStat(models.Model):
+    """词条每日统计"""
+    article = models.ForeignKey(Article, on_delete=models.CASCADE,
+                                related_name='daily_stats', verbose_name='所属词条')
+    date = models.DateField(verbose_name='日期')
+    views = models.PositiveIntegerField(default=0, verbose_name='浏览数')
+    likes = models.PositiveIntegerField(default=0, verbose_name='点赞数')
+    comments = models.PositiveIntegerField(default=0, verbose_name='评论数')
+    
+    class Meta:
+        verbose_name = '词条每日统计'
+        verbose_name_plural = '词条每日统计'
+        unique_together = ['article', 'date']
+    
+    def __str__(self):
+        return f"{self.article_id} {self.date}"
+
+
+class CategoryDailyStat(models.Model):
+    """分类每日统计"""
+    category = models.ForeignKey(Category, on_delete=models.CASCADE,
+                                 related_name='daily_stats', verbose_name='所属分类')
+    date = models.DateField(verbose_name='日期')
+    views = models.PositiveIntegerField(default=0, verbose_name='浏览数')
+    likes = models.PositiveIntegerField(default=0, verbose_name='点赞数')
+    comments = models.PositiveIntegerField(default=0, verbose_name='评论数')
+    
+    class Meta:
+        verbose_name = '分类每日统计'
+        verbose_name_plural = '分类每日统计'
+        unique_together = ['category', 'date']
+    
+    def __str__(self):
+        return f"{self.category_id} {self.date}"
@@ -0,0 +1,138 @@
+"""
+匿名用户整页缓存 - 百度百科风格项目
+
+页面在渲染时记录它依赖的词条、分类（依赖标签），缓存条目保存各标签当时的版本号。
+数据变更时只需更新相关标签的版本号，依赖这些标签的页面在下次读取时即视为失效，
+无需清空整个缓存。
+
+版本号即标签最近一次失效的时间戳：渲染期间若有依赖标签失效（版本号晚于渲染开始），
+页面可能包含旧数据，本次不写入缓存。
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+PAGE_CACHE_KEY = 'baike:page:{}'
+TAG_VERSION_KEY = 'baike:tagts:{}'
+
+ARTICLE_LIST_TAG = 'article:list'
+# 词条的可搜索内容（标题、摘要、正文、分类、标签），变化时搜索分面统计失效
+ARTICLE_SEARCH_TAG = 'article:search'
+CATEGORY_LIST_TAG = 'category:list'
+
+
+def article_tag(article_id):
+    """单个词条的依赖标签"""
+    return f'article:{article_id}'
+
+
+def category_tag(category_id):
+    """单个分类的依赖标签"""
+    return f'category:{category_id}'
+
+
+def record_page_dependencies(request, *tags):
+    """记录当前页面依赖的标签，None 会被忽略"""
+    page_tags = getattr(request, '_page_cache_tags', None)
+    if page_tags is None:
+        page_tags = request._page_cache_tags = set()
+    page_tags.update(tag for tag in tags if tag is not None)
+
+
+def record_articles(request, articles):
+    """记录页面中渲染的一组词条及其分类"""
+    for article in articles:
+        record_page_dependencies(
+            request,
+            article_tag(article.pk),
+            category_tag(article.category_id) if article.category_id else None,
+        )
+
+
+def invalidate_tags(*tags):
+    """更新标签版本号（当前时间戳），使依赖这些标签的页面全部失效"""
+    now = time.time()
+    cache.set_many({TAG_VERSION_KEY.format(tag): now for tag in tags}, timeout=None)
+
+
+def current_versions(tags):
+    """读取标签当前版本号，缺失（如被淘汰）的标签补建新版本"""
+    keys = {TAG_VERSION_KEY.format(tag): tag for tag in tags}
+    found = cache.get_many(keys.keys())
+    # 补建的版本号取一个缓存有效期之前的时间，早于正在进行的渲染，不会阻止其写入缓存
+    created = time.time() - settings.BAIKE_PAGE_CACHE_TIMEOUT
+    missing = {key: created for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return {keys[key]: version for key, version in found.items()}
+
+
+def get_tag_version(tag):
+    """单个标签的当前版本号，可作为其他缓存键的一部分"""
+    return current_versions([tag])[tag]
+
+
+def _page_cache_key(request):
+    """按路径和查询字符串区分页面，不含协议、域名和端口，使同一页面不论从哪个地址访问都共用缓存"""
+    path = request.get_full_path()
+    return PAGE_CACHE_KEY.format(hashlib.md5(path.encode('utf-8')).hexdigest())
+
+
+def _is_cacheable_request(request):
+    """只缓存匿名用户的 GET/HEAD 请求，有待显示消息时不走缓存"""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if 'messages' in request.COOKIES:
+        return False
+    return not request.user.is_authenticated
+
+
+def cache_anonymous_page(on_hit=None):
+    """
+    匿名用户整页缓存装饰器
+
+    on_hit 在命中缓存时以视图参数调用，用于执行仍需发生的副作用（如浏览计数）。
+    缓存时长即 BAIKE_PAGE_CACHE_TIMEOUT，页面中的计数最多滞后这么久。
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not settings.BAIKE_PAGE_CACHE_ENABLED or not _is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _page_cache_key(request)
+            entry = cache.get(key)
+            if entry is not None:
+                current = cache.get_many(TAG_VERSION_KEY.format(tag) for tag in entry['versions'])
+                if all(
+                    current.get(TAG_VERSION_KEY.format(tag)) == version
+                    for tag, version in entry['versions'].items()
+                ):
+                    if on_hit is not None:
+                        on_hit(request, *args, **kwargs)
+                    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+                    response['X-Page-Cache'] = 'HIT'
+                    return response
+
+            render_started = time.time()
+            response = view_func(request, *args, **kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response = response.render()
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                response['X-Page-Cache'] = 'MISS'
+                versions = current_versions(getattr(request, '_page_cache_tags', set()))
+                # 渲染期间依赖标签已失效，页面可能混有旧数据，不写入缓存
+                if all(version < render_started for version in versions.values()):
+                    cache.set(key, {
+                        'content': response.content,
+                        'content_type': response['Content-Type'],
+                        'versions': versions,
+                    }, settings.BAIKE_PAGE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
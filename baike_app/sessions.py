@@ -0,0 +1,42 @@
+"""
+会话存储后端 - 百度百科风格项目
+
+在 Django 自带的 cached_db 会话之上增加写合并：会话数据与读取时一致时
+跳过回写，避免每个请求都对数据库和缓存各写一次。
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+
+
+class SessionStore(CachedDBStore):
+    """带写合并的缓存+数据库会话存储"""
+
+    _loaded_fingerprint = None
+
+    @staticmethod
+    def _fingerprint(data):
+        """计算会话数据的指纹，用于判断数据是否真正发生变化"""
+        payload = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+    def load(self):
+        """读取会话数据并记录指纹"""
+        data = super().load()
+        self._loaded_fingerprint = self._fingerprint(data)
+        return data
+
+    def save(self, must_create=False):
+        """仅在会话数据变化时回写"""
+        if (
+            not must_create
+            and self.session_key is not None
+            and not settings.SESSION_SAVE_EVERY_REQUEST
+            and self._loaded_fingerprint is not None
+            and self._loaded_fingerprint == self._fingerprint(self._get_session())
+        ):
+            return
+        super().save(must_create)
+        self._loaded_fingerprint = self._fingerprint(self._get_session())
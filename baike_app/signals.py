@@ -0,0 +1,129 @@
+"""
+信号处理 - 百度百科风格项目
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .analytics import event_buffer
+from .dedup import index_article
+from .likes import invalidate_liked_set
+from .middleware import user_cache_key
+from .models import Article, Category, Comment, Like, Tag
+from .page_cache import (
+    ARTICLE_LIST_TAG, ARTICLE_SEARCH_TAG, CATEGORY_LIST_TAG, article_tag, category_tag, invalidate_tags,
+)
+
+# 只更新这些计数字段时不清除页面缓存，计数在缓存有效期内允许滞后
+COUNTER_FIELDS = frozenset(['view_count', 'like_count'])
+
+
+def _purge_on_commit(*tags):
+    """事务提交后再使页面失效，保证版本号变化时新数据已对其他请求可见；
+    渲染期间发生的失效由页面缓存写入前的版本号时间戳检查处理"""
+    tags = [tag for tag in tags if tag is not None]
+    transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """用户信息变化时清除缓存的用户对象"""
+    cache.delete(user_cache_key(instance.pk))
+
+
+def _search_fields_changed(instance, update_fields):
+    """本次保存是否改变了参与搜索的字段"""
+    if update_fields and not set(update_fields) & set(Article.SEARCH_FIELDS):
+        return False
+    return instance.search_digest() != getattr(instance, '_loaded_search_digest', None)
+
+
+@receiver(post_save, sender=Article)
+def purge_article_pages_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """词条保存时清除该词条、所属分类的页面，发布状态变化时清除列表页，搜索内容变化时清除分面统计"""
+    if update_fields and set(update_fields) <= COUNTER_FIELDS:
+        return
+
+    loaded_category_id = getattr(instance, '_loaded_category_id', None)
+    tags = [article_tag(instance.pk)]
+    for category_id in {instance.category_id, loaded_category_id}:
+        if category_id:
+            tags.append(category_tag(category_id))
+    if (created or instance.deleted_at
+            or instance.status != getattr(instance, '_loaded_status', None)):
+        tags.append(ARTICLE_LIST_TAG)
+    search_changed = _search_fields_changed(instance, update_fields)
+    if search_changed or instance.category_id != loaded_category_id:
+        tags.append(ARTICLE_SEARCH_TAG)
+    _purge_on_commit(*tags)
+
+    instance._loaded_status = instance.status
+    instance._loaded_category_id = instance.category_id
+    if search_changed:
+        instance._loaded_search_digest = instance.search_digest()
+
+
+@receiver(post_delete, sender=Article)
+def purge_article_pages_on_delete(sender, instance, **kwargs):
+    """词条删除时清除相关页面"""
+    _purge_on_commit(
+        article_tag(instance.pk),
+        category_tag(instance.category_id) if instance.category_id else None,
+        ARTICLE_LIST_TAG,
+    )
+
+
+@receiver([post_save, post_delete], sender=Category)
+def purge_category_pages(sender, instance, **kwargs):
+    """分类变化时清除该分类页面和分类列表"""
+    _purge_on_commit(category_tag(instance.pk), CATEGORY_LIST_TAG)
+
+
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Tag.articles.through)
+def purge_tag_facets(sender, **kwargs):
+    """标签或词条标签关联（如后台内联编辑）变化时清除标签分面统计"""
+    _purge_on_commit(ARTICLE_SEARCH_TAG)
+
+
+@receiver(m2m_changed, sender=Tag.articles.through)
+def purge_tag_facets_on_m2m_change(sender, action, **kwargs):
+    """通过 tag.articles / article.tags 增删关联（如后台标签自动补全）时清除标签分面统计"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _purge_on_commit(ARTICLE_SEARCH_TAG)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=Like)
+def purge_article_interaction_pages(sender, instance, **kwargs):
+    """评论、点赞变化时只清除所属词条的页面"""
+    _purge_on_commit(article_tag(instance.article_id))
+
+
+@receiver(post_save, sender=Article)
+def update_article_signature(sender, instance, update_fields=None, **kwargs):
+    """词条内容保存时重新计算近似重复签名"""
+    if update_fields and 'content' not in update_fields:
+        return
+    index_article(instance)
+
+
+@receiver([post_save, post_delete], sender=Like)
+def invalidate_liked_set_on_change(sender, instance, **kwargs):
+    """
+    点赞、取消点赞（含 ORM 级联删除）时，事务提交后删除用户点赞集合缓存
+
+    purge_deleted_articles 以原生 SQL 删除点赞、不发送信号，已清理词条的 ID 会留在
+    集合中直到缓存过期；这些词条已不存在，不影响页面显示。
+    """
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_liked_set(user_id))
+
+
+@receiver(request_finished)
+def flush_analytics_events(sender, **kwargs):
+    """请求结束时检查刷新间隔，避免空闲 worker 的缓冲事件长时间不写入"""
+    event_buffer.flush_if_due()
@@ -0,0 +1,118 @@
+"""
+写接口限流 - 百度百科风格项目
+
+基于缓存的固定窗口计数，分别按登录用户和客户端 IP 计数。计数使用缓存后端的原子
+add/incr，并发突发请求不会同时通过；被拒绝的请求会退回已计入的次数，不占用另一维度
+的额度。检查只读取会话中的用户 ID 和缓存，不触发任何 ORM 查询，超限请求在进入视图前
+直接返回 429。被限流次数可通过 manage.py throttle_stats 查看。
+部署在反向代理之后时需配置 BAIKE_THROTTLE_IP_HEADER，否则 IP 限额为全站共用。
+"""
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.http import HttpResponse
+
+WINDOW_KEY = 'baike:throttle:{}:{}:{}:{}'
+COUNTER_KEY = 'baike:throttle:count:{}'
+
+PERIODS = {
+    's': 1,
+    'sec': 1,
+    'm': 60,
+    'min': 60,
+    'h': 3600,
+    'hour': 3600,
+}
+
+
+def parse_rate(rate):
+    """'30/min' -> (每个窗口允许 30 次, 窗口长度 60 秒)"""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period]
+
+
+def _client_ip(request):
+    """客户端 IP：配置了可信代理请求头时取其中最右侧的地址，否则取 REMOTE_ADDR"""
+    header = settings.BAIKE_THROTTLE_IP_HEADER
+    if header:
+        meta_key = 'HTTP_' + header.upper().replace('-', '_')
+        forwarded = [ip.strip() for ip in request.META.get(meta_key, '').split(',') if ip.strip()]
+        if forwarded:
+            return forwarded[-1]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _incr(key, timeout):
+    """原子地计数加一，返回加一后的值"""
+    cache.add(key, 0, timeout=timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # add 与 incr 之间条目恰好过期
+        cache.set(key, 1, timeout=timeout)
+        return 1
+
+
+def _count_throttled(scope):
+    _incr(COUNTER_KEY.format(scope), None)
+
+
+def throttled_counts():
+    """各接口被限流的请求数"""
+    scopes = settings.BAIKE_THROTTLE_RATES.keys()
+    counts = cache.get_many(COUNTER_KEY.format(scope) for scope in scopes)
+    return {scope: counts.get(COUNTER_KEY.format(scope), 0) for scope in scopes}
+
+
+def check_throttle(request, scope):
+    """
+    检查请求是否超限，返回需要等待的秒数（0 表示放行）
+
+    各维度先原子计数，任一维度超限时退回本次在所有维度上的计数，
+    只有全部通过的请求才消耗额度。
+    """
+    rates = settings.BAIKE_THROTTLE_RATES.get(scope, {})
+    now = time.time()
+    user_id = request.session.get(SESSION_KEY)
+    idents = [('user', user_id), ('ip', _client_ip(request))]
+
+    counted = []
+    wait = 0
+    for kind, ident in idents:
+        if kind not in rates or not ident:
+            continue
+        limit, period = parse_rate(rates[kind])
+        window = int(now // period)
+        key = WINDOW_KEY.format(scope, kind, ident, window)
+        counted.append(key)
+        if _incr(key, period + 1) > limit:
+            wait = max(wait, (window + 1) * period - now)
+
+    if wait:
+        for key in counted:
+            try:
+                cache.decr(key)
+            except ValueError:
+                pass
+    return wait
+
+
+def throttle(scope):
+    """限流装饰器，应放在其他装饰器外层，保证在查询数据库之前执行"""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if settings.BAIKE_THROTTLE_ENABLED:
+                wait = check_throttle(request, scope)
+                if wait:
+                    _count_throttled(scope)
+                    response = HttpResponse('请求过于频繁，请稍后再试', status=429,
+                                            content_type='text/plain; charset=utf-8')
+                    response['Retry-After'] = str(int(wait) + 1)
+                    return response
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -2,7 +2,7 @@
 URL路由配置 - 百度百科风格项目
 """
 from django.urls import path
-from . import views
+from . import api, views
 
 app_name = 'baike_app'
 
@@ -22,4 +22,11 @@ urlpatterns = [
     # 分类相关
     path('categories/', views.category_list, name='category_list'),
     path('categories/<int:pk>/', views.CategoryDetailView.as_view(), name='category_detail'),
-]
\ No newline at end of file
+    
+    # 只读 JSON API
+    path('api/articles/', api.article_list, name='api_article_list'),
+    path('api/articles/<slug:slug>/', api.article_detail, name='api_article_detail'),
+    path('api/articles/<slug:slug>/comments/', api.comment_list, name='api_comment_list'),
+    path('api/categories/', api.category_list, name='api_category_list'),
+    path('api/tags/', api.tag_list, name='api_tag_list'),
+]
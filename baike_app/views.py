@@ -4,14 +4,35 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.utils.decorators import method_decorator
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
-from django.db.models import Q
 from django.contrib import messages
 from django.core.paginator import Paginator
 from django.db import models
+from django.db.models import Exists, OuterRef
+from .analytics import category_daily_series, record_event
+from .facets import get_facets, normalize_query, search_filter
+from .fragment_cache import cached_categories
+from .likes import get_liked_set
 from .models import Article, Category, Comment, Like, Tag
 from .forms import ArticleForm, CommentForm
+from .page_cache import (
+    ARTICLE_LIST_TAG, CATEGORY_LIST_TAG, cache_anonymous_page, category_tag,
+    record_articles, record_page_dependencies,
+)
+from .throttling import throttle
+from .warmup import is_warmup_request
+
+
+def _count_cached_view(request, slug):
+    """整页缓存命中时仍累加浏览次数"""
+    if is_warmup_request(request):
+        return
+    if Article.objects.filter(slug=slug, status='published').update(
+        view_count=models.F('view_count') + 1
+    ):
+        record_event('view', slug=slug)
 
 
 class ArticleListView(ListView):
@@ -26,30 +47,48 @@ class ArticleListView(ListView):
         queryset = Article.objects.filter(status='published').select_related('author', 'category')
         
         # 分类筛选
-        category_slug = self.request.GET.get('category')
-        if category_slug:
-            queryset = queryset.filter(category__slug=category_slug)
+        category_id = self.request.GET.get('category')
+        if category_id and category_id.isdigit():
+            queryset = queryset.filter(category_id=category_id)
+        
+        # 标签筛选：按词条表部分索引的顺序扫描，逐条用中间表 (tag_id, article_id)
+        # 唯一索引判断是否带有该标签，无需连接后再建临时 B 树排序
+        tag_id = self.request.GET.get('tag')
+        if tag_id and tag_id.isdigit():
+            queryset = queryset.filter(Exists(
+                Tag.articles.through.objects.filter(tag_id=tag_id, article_id=OuterRef('pk'))
+            ))
         
         # 搜索功能
-        search_query = self.request.GET.get('q')
+        search_query = normalize_query(self.request.GET.get('q'))
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) | 
-                Q(content__icontains=search_query) |
-                Q(summary__icontains=search_query)
-            )
+            queryset = queryset.filter(search_filter(search_query))
         
         return queryset
     
     def get_context_data(self, **kwargs):
         """添加上下文数据"""
         context = super().get_context_data(**kwargs)
-        context['categories'] = Category.objects.all()
-        context['search_query'] = self.request.GET.get('q', '')
+        search_query = self.request.GET.get('q', '')
+        categories = cached_categories()
+        
+        # 分面统计：当前搜索词在各分类、标签、状态下的命中数
+        facets = get_facets(search_query)
+        for category in categories:
+            category.hit_count = facets['categories'].get(category.pk, 0)
+        
+        context['categories'] = categories
+        context['tag_facets'] = facets['tags']
+        context['status_facets'] = [
+            (label, facets['statuses'].get(value, 0)) for value, label in Article.STATUS_CHOICES
+        ]
+        context['search_query'] = search_query
         context['selected_category'] = self.request.GET.get('category', '')
+        context['selected_tag'] = self.request.GET.get('tag', '')
         return context
 
 
+@method_decorator(cache_anonymous_page(on_hit=_count_cached_view), name='dispatch')
 class ArticleDetailView(DetailView):
     """词条详情视图"""
     model = Article
@@ -59,9 +98,10 @@ class ArticleDetailView(DetailView):
     def get_object(self, queryset=None):
         """获取词条对象并增加浏览次数"""
         obj = super().get_object(queryset)
-        if obj.status == 'published':
+        if obj.status == 'published' and not is_warmup_request(self.request):
             obj.view_count += 1
             obj.save(update_fields=['view_count'])
+            record_event('view', article_id=obj.pk)
         return obj
     
     def get_context_data(self, **kwargs):
@@ -69,15 +109,10 @@ class ArticleDetailView(DetailView):
         context = super().get_context_data(**kwargs)
         context['comment_form'] = CommentForm()
         context['comments'] = self.object.comments.filter(is_active=True).select_related('author')
+        record_articles(self.request, [self.object])
         
         # 检查用户是否已点赞
-        if self.request.user.is_authenticated:
-            context['user_has_liked'] = Like.objects.filter(
-                article=self.object, 
-                user=self.request.user
-            ).exists()
-        else:
-            context['user_has_liked'] = False
+        context['user_has_liked'] = self.object.pk in get_liked_set(self.request.user)
             
         return context
 
@@ -130,12 +165,14 @@ class ArticleDeleteView(LoginRequiredMixin, DeleteView):
             return redirect('article_detail', slug=obj.slug)
         return super().dispatch(request, *args, **kwargs)
     
-    def delete(self, request, *args, **kwargs):
-        """删除成功提示"""
-        messages.success(request, '词条删除成功！')
-        return super().delete(request, *args, **kwargs)
+    def form_valid(self, form):
+        """软删除词条，关联数据由 purge_deleted_articles 命令后台清理"""
+        self.object.soft_delete()
+        messages.success(self.request, '词条删除成功！')
+        return redirect(self.get_success_url())
 
 
+@throttle('article_like')
 @login_required
 def like_article(request, slug):
     """点赞词条"""
@@ -156,12 +193,14 @@ def like_article(request, slug):
         # 新点赞
         article.like_count += 1
         liked = True
+        record_event('like', article_id=article.pk)
     
     article.save(update_fields=['like_count'])
     
     return redirect('article_detail', slug=slug)
 
 
+@throttle('add_comment')
 @login_required
 def add_comment(request, slug):
     """添加评论"""
@@ -174,17 +213,21 @@ def add_comment(request, slug):
             comment.article = article
             comment.author = request.user
             comment.save()
+            record_event('comment', article_id=article.pk)
             messages.success(request, '评论添加成功！')
     
     return redirect('article_detail', slug=slug)
 
 
+@cache_anonymous_page()
 def category_list(request):
     """分类列表视图"""
     categories = Category.objects.all()
+    record_page_dependencies(request, CATEGORY_LIST_TAG)
     return render(request, 'baike_app/category_list.html', {'categories': categories})
 
 
+@method_decorator(cache_anonymous_page(), name='dispatch')
 class CategoryDetailView(DetailView):
     """分类详情视图"""
     model = Category
@@ -209,10 +252,15 @@ class CategoryDetailView(DetailView):
         total_likes = articles.aggregate(total_likes=models.Sum('like_count'))['total_likes'] or 0
         
         # 热门词条（按浏览次数排序）
-        popular_articles = articles.order_by('-view_count')[:5]
+        popular_articles = list(articles.order_by('-view_count')[:5])
         
         # 最新词条
-        recent_articles = articles.order_by('-created_at')[:5]
+        recent_articles = list(articles.order_by('-created_at')[:5])
+        
+        # 记录页面缓存依赖
+        record_page_dependencies(self.request, category_tag(self.object.pk))
+        record_articles(self.request, page_obj.object_list)
+        record_articles(self.request, popular_articles + recent_articles)
         
         context['articles'] = page_obj
         context['page_obj'] = page_obj
@@ -220,24 +268,30 @@ class CategoryDetailView(DetailView):
         context['total_likes'] = total_likes
         context['popular_articles'] = popular_articles
         context['recent_articles'] = recent_articles
+        context['daily_stats'] = category_daily_series(self.object)
         return context
 
 
+@cache_anonymous_page()
 def home(request):
     """首页视图"""
     # 获取热门词条（按浏览次数排序）
-    popular_articles = Article.objects.filter(
+    popular_articles = list(Article.objects.filter(
         status='published'
-    ).order_by('-view_count')[:5]
+    ).order_by('-view_count')[:5])
     
     # 获取最新词条
-    latest_articles = Article.objects.filter(
+    latest_articles = list(Article.objects.filter(
         status='published'
-    ).order_by('-created_at')[:5]
+    ).order_by('-created_at')[:5])
     
     # 获取所有分类
     categories = Category.objects.all()[:8]
     
+    # 记录页面缓存依赖
+    record_page_dependencies(request, ARTICLE_LIST_TAG, CATEGORY_LIST_TAG)
+    record_articles(request, popular_articles + latest_articles)
+    
     context = {
         'popular_articles': popular_articles,
         'latest_articles': latest_articles,
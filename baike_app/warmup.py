@@ -0,0 +1,132 @@
+"""
+部署预热 - 百度百科风格项目
+
+分两类步骤：
+- 进程内步骤（URL 解析器、模板编译、数据库连接）：每个 worker 各自执行，
+  可在 gunicorn 的 post_fork 钩子或 wsgi.py 中调用 warm_process()
+- 共享缓存步骤（热门词条/分类页面、分类列表、分面统计）：缓存为本机共享，
+  部署后执行一次 manage.py warmup 即可
+
+预热请求在 WSGI environ 中带有 WARMUP_ENVIRON_KEY 标记（键名不以 HTTP_ 开头，
+任何 HTTP 请求头都无法伪造），视图据此不计入浏览次数和行为统计。
+"""
+import time
+
+from django.conf import settings
+from django.db import connection, models
+from django.template.loader import get_template
+from django.urls import get_resolver, reverse
+
+from .facets import get_facets
+from .fragment_cache import cached_categories
+from .models import Article
+
+WARMUP_ENVIRON_KEY = 'baike.warmup'
+
+# 视图使用的模板，预先编译进缓存加载器
+TEMPLATE_NAMES = [
+    'base.html',
+    'baike_app/home.html',
+    'baike_app/article_list.html',
+    'baike_app/article_detail.html',
+    'baike_app/article_form.html',
+    'baike_app/category_list.html',
+    'baike_app/category_detail.html',
+]
+
+
+def is_warmup_request(request):
+    """是否为预热请求"""
+    return request.META.get(WARMUP_ENVIRON_KEY) is True
+
+
+def _timed(name, func, timings):
+    started = time.monotonic()
+    result = func()
+    timings.append((name, time.monotonic() - started, result))
+    return result
+
+
+def _load_url_resolvers():
+    """导入全部 URLconf 并构建反向解析表"""
+    resolver = get_resolver()
+    reverse('baike_app:home')
+    return len(resolver.url_patterns)
+
+
+def _compile_templates():
+    for name in TEMPLATE_NAMES:
+        get_template(name)
+    return len(TEMPLATE_NAMES)
+
+
+def _open_database():
+    connection.ensure_connection()
+    return connection.vendor
+
+
+def warm_process():
+    """进程内预热，返回 [(步骤, 耗时秒, 结果)]"""
+    timings = []
+    _timed('URL 解析器', _load_url_resolvers, timings)
+    _timed('模板编译', _compile_templates, timings)
+    _timed('数据库连接', _open_database, timings)
+    return timings
+
+
+def post_fork(server=None, worker=None):
+    """gunicorn post_fork 钩子：在 gunicorn 配置文件中 from baike_app.warmup import post_fork"""
+    warm_process()
+
+
+def _top_article_paths(top_n):
+    slugs = Article.objects.filter(status='published').order_by('-view_count').values_list(
+        'slug', flat=True
+    )[:top_n]
+    return [reverse('baike_app:article_detail', args=[slug]) for slug in slugs]
+
+
+def _top_category_paths(top_n):
+    rows = Article.objects.filter(
+        status='published', category__isnull=False
+    ).values('category_id').annotate(
+        views=models.Sum('view_count')
+    ).order_by('-views')[:top_n]
+    return [reverse('baike_app:category_detail', args=[row['category_id']]) for row in rows]
+
+
+def _warm_pages(paths, host):
+    """以匿名用户身份请求页面，写入整页缓存和片段缓存"""
+    from django.test import Client
+
+    client = Client(HTTP_HOST=host, raise_request_exception=False, **{WARMUP_ENVIRON_KEY: True})
+    failed = [path for path in paths if client.get(path).status_code != 200]
+    return f'{len(paths) - len(failed)}/{len(paths)}'
+
+
+def _warm_shared_data():
+    categories = cached_categories()
+    get_facets('')
+    return len(categories)
+
+
+def default_host():
+    """预热请求使用的 Host（只需通过 ALLOWED_HOSTS 校验），取其中第一个具体域名"""
+    for host in settings.ALLOWED_HOSTS:
+        if host and '*' not in host and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+def warm_shared_caches(top_n=20, host=None):
+    """预热共享缓存，返回 [(步骤, 耗时秒, 结果)]"""
+    host = host or default_host()
+    timings = []
+    _timed('分类与分面数据', _warm_shared_data, timings)
+    article_paths = _timed('热门词条查询', lambda: _top_article_paths(top_n), timings)
+    category_paths = _timed('热门分类查询', lambda: _top_category_paths(top_n), timings)
+    _timed('首页与分类列表', lambda: _warm_pages(
+        [reverse('baike_app:home'), reverse('baike_app:category_list')], host), timings)
+    _timed('热门词条页面', lambda: _warm_pages(article_paths, host), timings)
+    _timed('热门分类页面', lambda: _warm_pages(category_paths, host), timings)
+    return timings
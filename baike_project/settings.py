@@ -35,7 +35,7 @@ MIDDLEWARE = [
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'baike_app.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -46,13 +46,21 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # 模板只编译一次并在进程内复用（DEBUG 下 Django 会在模板文件变化时自动重置）
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'baike_app.context_processors.liked_articles',
+                'baike_app.context_processors.fragment_cache',
             ],
         },
     },
@@ -70,6 +78,19 @@ DATABASES = {
     }
 }
 
+# Cache
+# 默认使用本机共享的 SQLite 缓存，同一主机上的所有 worker 共享一份缓存；
+# 可通过环境变量切换为其他后端（如 django.core.cache.backends.redis.RedisCache）
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('BAIKE_CACHE_BACKEND', 'baike_app.cache_backend.SQLiteCache'),
+        'LOCATION': os.environ.get('BAIKE_CACHE_LOCATION', str(BASE_DIR / 'cache.sqlite3')),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('BAIKE_CACHE_MAX_ENTRIES', 10000)),
+        },
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -120,4 +141,44 @@ LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 
 # Email backend (for development)
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
\ No newline at end of file
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+# Sessions
+# 默认使用带写合并的缓存+数据库会话，可通过环境变量切换为纯缓存会话
+# ('django.contrib.sessions.backends.cache') 或默认数据库会话
+SESSION_ENGINE = os.environ.get('BAIKE_SESSION_ENGINE', 'baike_app.sessions')
+
+# 消息仅存放在 Cookie 中，避免 messages.success 触发会话回写
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+# 已登录用户对象缓存时间（秒），用户信息保存或删除时自动失效
+BAIKE_USER_CACHE_TIMEOUT = int(os.environ.get('BAIKE_USER_CACHE_TIMEOUT', 60))
+
+# 匿名用户整页缓存
+BAIKE_PAGE_CACHE_ENABLED = os.environ.get('BAIKE_PAGE_CACHE_ENABLED', '1') == '1'
+# 页面缓存时间（秒），也是页面中浏览次数等计数允许滞后的最长时间
+BAIKE_PAGE_CACHE_TIMEOUT = int(os.environ.get('BAIKE_PAGE_CACHE_TIMEOUT', 60))
+
+# 行为统计：事件缓冲条数达到上限或超过刷新间隔（秒）时批量写入
+BAIKE_ANALYTICS_BUFFER_SIZE = int(os.environ.get('BAIKE_ANALYTICS_BUFFER_SIZE', 100))
+BAIKE_ANALYTICS_FLUSH_INTERVAL = int(os.environ.get('BAIKE_ANALYTICS_FLUSH_INTERVAL', 10))
+
+# 用户点赞词条集合缓存时间（秒），点赞/取消点赞时就地更新
+BAIKE_LIKED_SET_TIMEOUT = int(os.environ.get('BAIKE_LIKED_SET_TIMEOUT', 3600))
+
+# 写接口限流（固定窗口计数），格式为 '次数/周期'（周期支持 s、min、hour），超限返回 429
+BAIKE_THROTTLE_ENABLED = os.environ.get('BAIKE_THROTTLE_ENABLED', '1') == '1'
+BAIKE_THROTTLE_RATES = {
+    'article_like': {'user': '30/min', 'ip': '60/min'},
+    'add_comment': {'user': '5/min', 'ip': '20/min'},
+}
+# 按 IP 限流时读取客户端地址的请求头（如 X-Forwarded-For），部署在反向代理之后时必须设置，
+# 否则所有请求的 REMOTE_ADDR 都是代理地址，ip 限额会变成全站共用；
+# 只应设置为由可信代理写入的请求头，取其中最右侧（代理追加）的地址
+BAIKE_THROTTLE_IP_HEADER = os.environ.get('BAIKE_THROTTLE_IP_HEADER', '')
+
+# 搜索分面统计缓存时间（秒），词条新增、删除或状态变化时立即失效
+BAIKE_FACET_CACHE_TIMEOUT = int(os.environ.get('BAIKE_FACET_CACHE_TIMEOUT', 300))
+
+# 导航栏、页脚、分类侧栏等公共片段的缓存时间（秒），分类变化时立即失效
+BAIKE_FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('BAIKE_FRAGMENT_CACHE_TIMEOUT', 3600))
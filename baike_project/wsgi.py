@@ -13,4 +13,10 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'baike_project.settings')
 
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+# 设置 BAIKE_WARMUP_ON_START=1 时，worker 启动即预加载 URL 解析器、模板和数据库连接；
+# 使用 gunicorn --preload 时应改在配置文件中挂载 baike_app.warmup.post_fork
+if os.environ.get('BAIKE_WARMUP_ON_START') == '1':
+    from baike_app.warmup import warm_process
+
+    warm_process()